@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+"""
+schema inference over wide records
+
+    PYTHONPATH=. python benchmarks/bench_class_builder.py
+"""
+
+import time
+from flexible_dict.script.class_builder import ClassBuilder
+
+def run(title: str, builder: ClassBuilder, record: dict, n: int):
+    start = time.perf_counter()
+    for _ in range(n):
+        builder.build('Event', record)
+    elapsed = time.perf_counter() - start
+    print(f"{title:>24}: {len(record)} keys x {n} records: {elapsed:.2f} s, {elapsed / n * 1e6:.1f} us per record")
+
+def main(keys=500, n=100000):
+    record = {f'key_{i}': i for i in range(keys)}
+    run('unchanged names', ClassBuilder(field_name_style='unchanged', list_filed_name_form='unchanged'), record, n)
+    # camel case keys with list values go through name styling and inflect
+    record = {f'eventKey{i}': [i] if i % 2 else i for i in range(keys)}
+    run('styled names', ClassBuilder(), record, n // 10)
+
+if __name__ == '__main__':
+    main()
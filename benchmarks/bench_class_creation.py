@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+measure the cost of decorating json_object classes, as paid at import time
+
+    PYTHONPATH=. python benchmarks/bench_class_creation.py
+"""
+
+import sys
+import time
+import tempfile
+from typing import List, Optional
+import flexible_dict as fd
+
+# the module, not the decorator exported with the same name
+json_object_module = sys.modules['flexible_dict.json_object']
+
+@fd.json_object
+class Item:
+    name: str
+    price: float
+
+def make_class(index: int, n_fields: int) -> type:
+    annotations = {}
+    for i in range(n_fields):
+        annotations[f'c{index}_f{i}'] = [int, str, Item, List[Item], Optional[Item]][i % 5]
+    return type(f'C{index}', (), {'__annotations__': annotations})
+
+def bench(name: str, n_classes=300, n_fields=40, cold=True, **kwargs):
+    classes = [make_class(i, n_fields) for i in range(n_classes)]
+    json_object_module._factories.clear()
+    cost = 0
+    for cls in classes:
+        if cold:
+            # nothing compiled before, as at the first class of a process
+            json_object_module._factories.clear()
+        start = time.perf_counter()
+        fd.json_object(cls, **kwargs)
+        cost += time.perf_counter() - start
+    print(f"{name:>24}: {cost / n_classes * 1e3:7.3f} ms per class, "
+          f"{cost / n_classes / n_fields * 1e6:7.2f} us per field")
+
+def bench_detect(name: str, detector, n_classes=300, n_fields=40):
+    annotations = [t for i in range(n_classes) for t in make_class(i, n_fields).__annotations__.values()]
+    # encoders are kept as fields of decorated classes keep them
+    encoders = []
+    start = time.perf_counter()
+    for t in annotations:
+        encoders.append(detector.detect_encoder(t))
+    cost = time.perf_counter() - start
+    print(f"{name:>24}: {cost / len(annotations) * 1e6:7.2f} us per field to detect encoder")
+
+def main():
+    bench_detect('AdapterDetector', fd.AdapterDetector())
+    bench_detect('CachedAdapterDetector', fd.CachedAdapterDetector())
+    bench('cold compiled code', cold=True)
+    bench('shared compiled code', cold=False)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        code_cache = fd.CodeCache(cache_dir)
+        bench('code cache, first run', code_cache=code_cache)
+        bench('code cache, warm start', code_cache=code_cache)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+compare a list of json_object instances with a ColumnTable
+
+    PYTHONPATH=. python benchmarks/bench_columnar.py
+"""
+
+import gc
+import time
+import tracemalloc
+import flexible_dict as fd
+
+class Record(fd.BaseDict):
+    id: int
+    amount: float
+    name: str
+
+def measure(build, n: int):
+    rows = [dict(id=i, amount=i * 0.5, name='n') for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(rows)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, records
+
+def main(n=200000):
+    size, records = measure(Record.from_list, n)
+    start = time.perf_counter()
+    total = sum(r.amount for r in records)
+    print(f"{'list':>14}: {size / n:6.1f} bytes per record, sum over rows {time.perf_counter() - start:.4f} s")
+
+    size, table = measure(Record.from_list_columnar, n)
+    start = time.perf_counter()
+    assert sum(r.amount for r in table) == total
+    t_rows = time.perf_counter() - start
+    start = time.perf_counter()
+    assert sum(table.column('amount')) == total
+    t_column = time.perf_counter() - start
+    print(f"{'ColumnTable':>14}: {size / n:6.1f} bytes per record, sum over rows {t_rows:.4f} s, "
+          f"sum over column {t_column:.4f} s")
+
+if __name__ == '__main__':
+    main()
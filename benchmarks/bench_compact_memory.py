@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+compare memory of dict based json_object instances with compact ones
+
+    PYTHONPATH=. python benchmarks/bench_compact_memory.py
+"""
+
+import gc
+import timeit
+import tracemalloc
+import flexible_dict as fd
+
+def make_class(compact: bool):
+    @fd.json_object(compact=compact)
+    class Record:
+        id: int
+        name: str
+        price: float
+        count: int
+        tag: str
+    return Record
+
+def measure(cls, n: int):
+    rows = [dict(id=i, name='n', price=1.5, count=i % 7, tag='t') for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [cls(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    read = timeit.timeit(lambda: records[0].price, number=100000) / 100000
+    return (after - before) / n, read, records
+
+def main(n=100000):
+    for name, compact in [('dict', False), ('compact', True)]:
+        size, read, _ = measure(make_class(compact), n)
+        print(f"{name:>8}: {size:6.1f} bytes per record, {read * 1e9:6.1f} ns per field read")
+
+if __name__ == '__main__':
+    main()
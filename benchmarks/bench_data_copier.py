@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""
+compare the recursive and the iterative data copier on deep and wide documents
+
+    PYTHONPATH=. python benchmarks/bench_data_copier.py
+"""
+
+import timeit
+from typing import List
+import flexible_dict as fd
+
+class Item(fd.BaseDict):
+    name: str
+    tags: List[str]
+
+def make_deep(depth: int) -> dict:
+    root = node = {}
+    for i in range(depth):
+        node['child'] = node = {'i': i}
+    return root
+
+def make_wide(n: int) -> dict:
+    shared = {'unit': 'kg', 'tags': ['a', 'b']}
+    return {
+        'items': [Item(name=f'item{i}', tags=['x', 'y']) for i in range(n)],
+        'raw': [{'i': i, 'meta': shared} for i in range(n)],
+    }
+
+def main(number=20):
+    copiers = [
+        ('recursive', fd.DataCopier()),
+        ('iterative', fd.IterativeDataCopier()),
+        ('iterative memo', fd.IterativeDataCopier(memo=True)),
+        ('iterative shared', fd.IterativeDataCopier(share_builtin=True)),
+    ]
+    for title, data in (('deep 200', make_deep(200)), ('deep 100000', make_deep(100000)),
+                        ('wide 10000', make_wide(10000))):
+        for name, copier in copiers:
+            try:
+                t = timeit.timeit(lambda: copier.copy(data), number=number) / number
+            except RecursionError:
+                print(f"{title:>12} {name:>17}: RecursionError")
+                continue
+            print(f"{title:>12} {name:>17}: {t * 1e3:8.3f} ms")
+
+if __name__ == '__main__':
+    main()
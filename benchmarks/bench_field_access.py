@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+compare reading fields through properties with the `__getattr__` dispatch
+
+    PYTHONPATH=. python benchmarks/bench_field_access.py
+"""
+
+import timeit
+from typing import List
+import flexible_dict as fd
+
+def make_class(create_field_property: bool):
+    @fd.json_object(create_field_property=create_field_property)
+    class Item:
+        a: int
+        b: str = fd.Field(key='bb')
+        c: float = fd.Field(getter_default=1.5)
+        d: List[int]
+    return Item
+
+def main(number=1000000):
+    data = {'a': 1, 'bb': 'two', 'd': [1, 2]}
+    for mode, create_field_property in [('__getattr__', False), ('property', True)]:
+        obj = make_class(create_field_property)(data)
+        t_plain = timeit.timeit(lambda: obj.a, number=number)
+        t_key = timeit.timeit(lambda: obj.b, number=number)
+        t_default = timeit.timeit(lambda: obj.c, number=number)
+        print(f"{mode:>12}: plain {t_plain / number * 1e9:6.1f} ns, "
+              f"key {t_key / number * 1e9:6.1f} ns, "
+              f"default {t_default / number * 1e9:6.1f} ns")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+size and speed of `pack` / `unpack` compared with json text
+
+    PYTHONPATH=. python benchmarks/bench_packing.py
+"""
+
+import json
+import timeit
+from typing import List
+import flexible_dict as fd
+from flexible_dict.packing import BACKENDS, msgpack
+
+class Item(fd.BaseDict):
+    sku: str
+    quantity: int
+    unit_price: float
+
+class Order(fd.BaseDict):
+    order_id: int
+    customer_name: str
+    shipping_address: str
+    items: List[Item]
+
+def main(number=2000):
+    order = Order(order_id=123456, customer_name='alice', shipping_address='1 main street',
+                  items=[dict(sku=f'sku-{i}', quantity=i, unit_price=i * 1.5) for i in range(10)])
+    text = json.dumps(order)
+    print(f"{'json':>8}: {len(text):>5} bytes, "
+          f"dumps {timeit.timeit(lambda: json.dumps(order), number=number) / number * 1e6:.1f} us, "
+          f"loads {timeit.timeit(lambda: Order(json.loads(text)), number=number) / number * 1e6:.1f} us")
+    for backend in BACKENDS:
+        if backend == 'msgpack' and msgpack is None:
+            continue
+        data = fd.pack(order, backend=backend)
+        print(f"{backend:>8}: {len(data):>5} bytes, "
+              f"dumps {timeit.timeit(lambda: fd.pack(order, backend=backend), number=number) / number * 1e6:.1f} us, "
+              f"loads {timeit.timeit(lambda: Order.unpack(data), number=number) / number * 1e6:.1f} us")
+
+if __name__ == '__main__':
+    main()
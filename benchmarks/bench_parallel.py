@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+build records from a json lines file in the main process and in worker processes
+
+    PYTHONPATH=. python benchmarks/bench_parallel.py
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import List
+import flexible_dict as fd
+
+class Item(fd.BaseDict):
+    name: str
+    price: float
+
+class Order(fd.BaseDict):
+    id: int
+    customer: str
+    items: List[Item]
+
+def main(n=200000):
+    handle, path = tempfile.mkstemp(suffix='.jsonl')
+    with os.fdopen(handle, 'w') as f:
+        for i in range(n):
+            record = dict(id=i, customer=f'c{i}', items=[dict(name=f'i{j}', price=j) for j in range(5)])
+            f.write(json.dumps(record) + '\n')
+    try:
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            serial = [Order(json.loads(line)) for line in f]
+        print(f"{'serial':>10}: {time.perf_counter() - start:.3f} s")
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            res = Order.from_jsonl_parallel(path, workers=workers)
+            print(f"{workers:>2} workers: {time.perf_counter() - start:.3f} s")
+            assert len(res) == len(serial)
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
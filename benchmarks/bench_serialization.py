@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+serialize json objects with a copy as built-in data and directly,
+parse json text with json.loads and the constructor, and with `loads`
+
+    PYTHONPATH=. python benchmarks/bench_serialization.py
+"""
+
+import json
+import timeit
+from typing import List
+import flexible_dict as fd
+from flexible_dict.serialization import BACKENDS
+
+class Item(fd.BaseDict):
+    name: str
+    price: float
+    tags: List[str]
+
+class Order(fd.BaseDict):
+    id: int
+    items: List[Item]
+
+def main(n=200):
+    order = Order(id=1, items=[dict(name=f'item{i}', price=i * 0.5, tags=['a', 'b']) for i in range(1000)])
+    t = timeit.timeit(lambda: json.dumps(fd.copy_as_builtin_json(order)), number=n) / n
+    print(f"{'copy + json.dumps':>20}: {t * 1e3:.3f} ms")
+    for backend in BACKENDS:
+        t = timeit.timeit(lambda: fd.dumps(order, backend=backend), number=n) / n
+        print(f"{'dumps ' + backend:>20}: {t * 1e3:.3f} ms")
+
+    text = fd.dumps(order)
+    t = timeit.timeit(lambda: Order(json.loads(text)), number=n) / n
+    print(f"{'json.loads + init':>20}: {t * 1e3:.3f} ms")
+    for backend in BACKENDS:
+        t = timeit.timeit(lambda: Order.loads(text, backend=backend), number=n) / n
+        print(f"{'loads ' + backend:>20}: {t * 1e3:.3f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+clone a large document and change one leaf, by a full copy and by a snapshot
+
+    PYTHONPATH=. python benchmarks/bench_snapshot.py
+"""
+
+import timeit
+from typing import List
+import flexible_dict as fd
+
+class Item(fd.BaseDict):
+    name: str
+    price: float
+
+class Section(fd.BaseDict):
+    title: str
+    items: List[Item]
+
+class Document(fd.BaseDict):
+    version: int
+    sections: List[Section]
+
+def main(number=100):
+    doc = Document(version=1, sections=[
+        dict(title=f's{i}', items=[dict(name=f'i{j}', price=j) for j in range(100)]) for i in range(100)
+    ])
+
+    def full_copy():
+        d = Document(fd.copy_as_builtin_json(doc))
+        d['sections'][3]['items'][5].price = 0
+
+    def cow():
+        d = doc.snapshot()
+        d['sections'][3]['items'][5].price = 0
+
+    for name, func in (('copy + init', full_copy), ('snapshot', cow)):
+        t = timeit.timeit(func, number=number) / number
+        print(f"{name:>12}: {t * 1e3:.3f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+get records by position from a json lines file, by a linear scan and by `JsonLinesStore`
+
+    PYTHONPATH=. python benchmarks/bench_store.py
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+import flexible_dict as fd
+
+class Record(fd.BaseDict):
+    id: int
+    name: str
+    tags: list
+
+def main(n=200000, lookups=100):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'records.jsonl')
+    index_path = path + '.idx'
+    with open(path, 'w') as f:
+        for i in range(n):
+            f.write(json.dumps(dict(id=i, name=f'r{i}', tags=['a', 'b', 'c'])) + '\n')
+    positions = [random.randrange(n) for _ in range(lookups)]
+    try:
+        start = time.perf_counter()
+        for pos in positions[:10]:
+            with open(path, 'rb') as f:
+                for i, line in enumerate(f):
+                    if i == pos:
+                        Record(json.loads(line))
+                        break
+        print(f"{'scan':>16}: {(time.perf_counter() - start) / 10 * 1e3:.3f} ms per lookup")
+
+        start = time.perf_counter()
+        fd.JsonLinesStore(path, cls=Record, index_path=index_path).close()
+        print(f"{'build index':>16}: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        start = time.perf_counter()
+        store = fd.JsonLinesStore(path, cls=Record, index_path=index_path)
+        print(f"{'load index':>16}: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        start = time.perf_counter()
+        for pos in positions:
+            store[pos]
+        print(f"{'store[i]':>16}: {(time.perf_counter() - start) / lookups * 1e3:.3f} ms per lookup")
+
+        start = time.perf_counter()
+        store[n // 2:n // 2 + 1000]
+        print(f"{'store[a:a+1000]':>16}: {(time.perf_counter() - start) * 1e3:.1f} ms")
+        store.close()
+    finally:
+        for p in (path, index_path):
+            if os.path.exists(p):
+                os.remove(p)
+        os.rmdir(directory)
+
+if __name__ == '__main__':
+    main()
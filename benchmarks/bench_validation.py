@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""
+cost of `validate=True` on construction and assignment
+
+    PYTHONPATH=. python benchmarks/bench_validation.py
+"""
+
+import timeit
+from typing import List, Optional
+import flexible_dict as fd
+
+def define(validate: bool):
+    @fd.json_object(validate=validate)
+    class Item:
+        name: str
+        price: float
+        tags: List[str]
+        note: Optional[str] = None
+
+    @fd.json_object(validate=validate)
+    class Order:
+        id: int
+        items: List[Item]
+
+    return Order
+
+def main(number=2000):
+    data = dict(id=1, items=[dict(name=f'item{i}', price=i * 0.5, tags=['a', 'b']) for i in range(100)])
+    results = {}
+    for validate in (False, True):
+        cls = define(validate)
+        t_init = min(timeit.repeat(lambda: cls(data), number=number, repeat=3)) / number
+        obj = cls(data)
+        t_set = min(timeit.repeat(lambda: setattr(obj, 'id', 2), number=number * 100, repeat=3)) / number / 100
+        results[validate] = t_init, t_set
+        print(f"validate={validate!s:>5}: init {t_init * 1e6:8.1f} us, set {t_set * 1e9:6.1f} ns")
+    print(f"overhead: init {results[True][0] / results[False][0] - 1:+.0%}, "
+          f"set {results[True][1] / results[False][1] - 1:+.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
 
 from .json_object import json_object, field, Field, MISSING, BaseDict
-from .utils import DataCopier, copy_as_builtin_json
+from .adapter import AdapterDetector, CachedAdapterDetector, JsonList
+from .code_cache import CodeCache
+from .compact import CompactDict
+from .columnar import ColumnTable
+from .utils import DataCopier, IterativeDataCopier, copy_as_builtin_json
+from .serialization import dumps, dumpb, dump, loads, load
+from .snapshot import snapshot
+from .instrument import get_stats
+from .aio import aiter_jsonl, aiter_jsonl_batches
+from .parallel import from_list_parallel, from_jsonl_parallel
+from .store import JsonLinesStore
+from .packing import pack, unpack
 from .version import __version__
 
 __all__ = [
     'json_object', 'BaseDict',
     'field', 'Field', 'MISSING',
-    'DataCopier', 'copy_as_builtin_json',
+    'AdapterDetector', 'CachedAdapterDetector', 'JsonList',
+    'CodeCache', 'CompactDict', 'ColumnTable',
+    'DataCopier', 'IterativeDataCopier', 'copy_as_builtin_json',
+    'dumps', 'dumpb', 'dump', 'loads', 'load',
+    'snapshot', 'get_stats',
+    'aiter_jsonl', 'aiter_jsonl_batches',
+    'from_list_parallel', 'from_jsonl_parallel',
+    'JsonLinesStore',
+    'pack', 'unpack',
     '__version__',
 ]
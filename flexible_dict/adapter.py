@@ -7,9 +7,14 @@
 from typing import (
     Any, List, Optional,
     Union, Callable, Tuple,
+    NamedTuple,
 )
 from abc import abstractmethod, ABC
+import collections
+import sys
 import dataclasses
+import threading
+import weakref
 
 class TypeAdapter(ABC):
     """
@@ -91,6 +96,108 @@ def encode(self, value: Any) -> Any:
             return self.type(value)
         return value
 
+class JsonArray(list):
+    """
+    a list returned by `JsonArrayEncoder` with `mark_encoded` set, marks the elements as already encoded
+    """
+
+class JsonList(list):
+    """
+    a list converting elements by an encoder when they are accessed,
+    the original elements are stored as they are until accessed;
+    since the storage is a list, `json.dumps` and other list consumers keep working.
+    Item access, iteration, slices, `in`, `index`, `count` and `==` see converted elements,
+    while functions reading the storage directly, e.g. `list.__iter__(lst)`, see raw ones
+    """
+    __slots__ = ('elem_encoder', 'memoize')
+
+    def __init__(self, iterable=(), elem_encoder: _ENCODER_TYPE = None, memoize=True):
+        """
+        :param iterable:        elements to store, they are not converted here
+        :param elem_encoder:    an encoder for list element, elements are returned unchanged if `None`
+        :param memoize:         if `True`, a converted element is stored back in place of the original one
+        """
+        super().__init__(iterable)
+        self.elem_encoder = None if elem_encoder is None else get_encoder_func(elem_encoder)
+        self.memoize = memoize
+
+    def _encode_at(self, index: int, value: Any) -> Any:
+        if self.elem_encoder is None:
+            return value
+        encoded = self.elem_encoder(value)
+        if self.memoize and encoded is not value:
+            list.__setitem__(self, index, encoded)
+        return encoded
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self.memoize:
+                # elements of the slice are converted here and stored back, so they are same as those of this list
+                value = [self._encode_at(i, list.__getitem__(self, i))
+                         for i in range(*index.indices(len(self)))]
+            else:
+                value = list.__getitem__(self, index)
+            return JsonList(value, self.elem_encoder, self.memoize)
+        return self._encode_at(index, list.__getitem__(self, index))
+
+    def __iter__(self):
+        for i, value in enumerate(list.__iter__(self)):
+            yield self._encode_at(i, value)
+
+    # methods comparing elements compare the converted ones
+
+    def __contains__(self, value) -> bool:
+        return any(x is value or x == value for x in self)
+
+    def index(self, value, start=0, stop=sys.maxsize) -> int:
+        for i in range(*slice(start, stop).indices(len(self))):
+            x = self[i]
+            if x is value or x == value:
+                return i
+        raise ValueError(f"{value!r} is not in list")
+
+    def count(self, value) -> int:
+        return sum(1 for x in self if x is value or x == value)
+
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return len(self) == len(other) and all(x is y or x == y for x, y in zip(self, other))
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None
+
+    # methods adding elements store them as they are, they are converted when accessed
+
+    def extend(self, iterable):
+        list.extend(self, list.__iter__(iterable) if isinstance(iterable, JsonList) else iterable)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __add__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        res = self.copy()
+        res.extend(other)
+        return res
+
+    def __reversed__(self):
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def pop(self, index=-1):
+        value = self[index]
+        list.pop(self, index)
+        return value
+
+    def copy(self) -> 'JsonList':
+        return JsonList(list.__iter__(self), self.elem_encoder, self.memoize)
+
 @dataclasses.dataclass
 class JsonArrayEncoder(Encoder):
     """
@@ -98,6 +205,13 @@ class JsonArrayEncoder(Encoder):
     """
     elem_encoder: _ENCODER_TYPE   # an encoder for list element, this arg must be set not `None`
 
+    # if `True`, return a `JsonList` converting elements when accessed instead of converting all of them
+    lazy: bool = False
+
+    # if `True`, return a `JsonArray` instead of a plain list,
+    # so that the getter of a lazy field can tell an encoded list from a raw one
+    mark_encoded: bool = False
+
     def __post_init__(self):
         self.elem_encoder = get_encoder_func(self.elem_encoder)
 
@@ -106,6 +220,12 @@ def encode(self, value: Optional[List[Any]]) -> Optional[List[Any]]:
             return value
         if not isinstance(value, list):
             raise ValueError("value is not a list")
+        if self.lazy:
+            if isinstance(value, JsonList) and value.elem_encoder == self.elem_encoder:
+                return value
+            return JsonList(value, self.elem_encoder)
+        if self.mark_encoded:
+            return JsonArray(self.elem_encoder(x) for x in value)
         return [self.elem_encoder(x) for x in value]
 
 NoneType = type(None)
@@ -115,12 +235,20 @@ def get_typing_args(t: type) -> Tuple[type, ...]:
     try:
         return t.__args__  # type: ignore
     except AttributeError:
-        return t.__origin__.__parameters__  # type: ignore
+        # a bare generic, e.g. `List`, whose origin `list` has no parameters since python 3.9
+        return getattr(t.__origin__, '__parameters__', ())  # type: ignore
 
 class AdapterDetector:
     """
     auto detect encoder and decoder for given type
     """
+    def __init__(self, lazy_array=False):
+        """
+        :param lazy_array:  if `True`, list values are wrapped by `JsonList` and elements
+                            are converted when accessed
+        """
+        self.lazy_array = lazy_array
+
     @staticmethod
     def detect_json_object_encoder(a_type: type) -> Optional[Encoder]:
         """
@@ -137,7 +265,8 @@ def get_list_element_type(t: type) -> Optional[type]:
         """
         if hasattr(t, '__origin__'):
             if t.__origin__ is list or t.__origin__ is List:
-                return get_typing_args(t)[0]
+                args = get_typing_args(t)
+                return args[0] if args else None
         return None
 
     def detect_list_encoder(self, a_type: type) -> Optional[Encoder]:
@@ -148,7 +277,7 @@ def detect_list_encoder(self, a_type: type) -> Optional[Encoder]:
         if elem_type is not None:
             elem_encoder = self.detect_encoder(elem_type)
             if elem_encoder is not None:
-                return JsonArrayEncoder(elem_encoder)
+                return JsonArrayEncoder(elem_encoder, lazy=self.lazy_array)
         return None
 
     def detect_union_encoder(self, a_type: type) -> Optional[Encoder]:
@@ -190,3 +319,92 @@ def detect_decoder(a_type: type) -> Optional[Decoder]:
         # user can rewrite this method for custom use
         return None
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+_NOT_CACHED = object()
+
+class CachedAdapterDetector(AdapterDetector):
+    """
+    an adapter detector memoizing detected encoders by type,
+    so that fields with same annotation share one encoder.
+    Types and encoders are referenced weakly, so the cache does not keep classes alive,
+    and the cache is guarded by a lock, so a detector can be shared by threads.
+    """
+    def __init__(self, lazy_array=False, maxsize=1024):
+        """
+        :param lazy_array:  same as `AdapterDetector`
+        :param maxsize:     max number of types to cache, least recently used types are dropped first
+        """
+        super().__init__(lazy_array=lazy_array)
+        self.maxsize = maxsize
+        # weak reference of type -> (weak reference of encoder or `None` if no encoder needed,
+        #                            weak reference of type to get notified when the type is collected)
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # keys whose types are collected, removed from the cache on next access
+        self._dead = []
+        self._hits = 0
+        self._misses = 0
+
+    def _purge(self):
+        # called with the lock held
+        while self._dead:
+            self._cache.pop(self._dead.pop(), None)
+
+    def detect_encoder(self, a_type: type) -> Optional[Encoder]:
+        try:
+            key = weakref.ref(a_type)
+            hash(key)
+        except TypeError:
+            # unhashable annotation, or one can not be referenced weakly, e.g. a string; nothing to cache
+            return super().detect_encoder(a_type)
+        with self._lock:
+            self._purge()
+            value = self._cache.get(key, _NOT_CACHED)
+            if value is not _NOT_CACHED:
+                value = value[0]
+                encoder = None if value is None else value()
+                if value is None or encoder is not None:
+                    self._hits += 1
+                    self._cache.move_to_end(key)
+                    return encoder
+            self._misses += 1
+
+        # detect without the lock, since the detection may look up element types recursively
+        encoder = super().detect_encoder(a_type)
+        try:
+            value = None if encoder is None else weakref.ref(encoder)
+        except TypeError:
+            return encoder
+        # the key is the basic weak reference, which is shared by later lookups of the type,
+        # so that keys are matched by identity instead of comparing types
+        dead = self._dead
+        notifier = weakref.ref(a_type, lambda _, _key=key: dead.append(_key))
+        with self._lock:
+            self._cache[key] = (value, notifier)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return encoder
+
+    def cache_info(self) -> CacheInfo:
+        """
+        hit and miss statistics of detected encoders
+        """
+        with self._lock:
+            self._purge()
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._dead.clear()
+            self._hits = 0
+            self._misses = 0
+
+# shared by json_object classes if no detector specified
+DEFAULT_ADAPTER_DETECTOR = CachedAdapterDetector()
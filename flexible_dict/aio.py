@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""
+read json objects from asyncio streams
+"""
+
+from typing import Any, AsyncIterator, List, Optional, Type
+from .serialization import get_parser
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+async def aiter_jsonl_batches(reader, cls: Optional[Type] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              max_line_size: int = 1 << 24, backend: Optional[str] = None
+                              ) -> AsyncIterator[List[Any]]:
+    """
+    read json lines from a stream, yield records decoded from each chunk as a list.
+    The next chunk is read only when the previous batch is consumed, so a slow consumer slows down reading,
+    and memory is bounded by a chunk and the longest line.
+    :param reader:          an `asyncio.StreamReader`, or any object with a coroutine method `read(n)`
+                            which returns bytes and an empty bytes at the end
+    :param cls:             a json_object class; if given, each record is converted as an instance of it
+    :param chunk_size:      max number of bytes to read at a time
+    :param max_line_size:   raise `ValueError` if a line spanning chunks grows longer than this
+    :param backend:         json backend to parse lines, see `flexible_dict.serialization`
+    """
+    parse = get_parser(backend)
+    # pieces of the last incomplete line, joined once a newline is read so a long line is copied once
+    pieces = []
+    pending = 0
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        if b'\n' not in chunk:
+            pieces.append(chunk)
+            pending += len(chunk)
+            if pending > max_line_size:
+                raise ValueError(f"line is longer than {max_line_size} bytes")
+            continue
+        pieces.append(chunk)
+        lines = b''.join(pieces).split(b'\n')
+        rest = lines.pop()
+        if len(rest) > max_line_size:
+            raise ValueError(f"line is longer than {max_line_size} bytes")
+        pieces = [rest] if rest else []
+        pending = len(rest)
+        batch = [parse(line) for line in lines if line.strip()]
+        if cls is not None:
+            batch = [cls(x) for x in batch]
+        if batch:
+            yield batch
+    rest = b''.join(pieces)
+    if rest.strip():
+        yield [parse(rest) if cls is None else cls(parse(rest))]
+
+async def aiter_jsonl(reader, cls: Optional[Type] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      max_line_size: int = 1 << 24, backend: Optional[str] = None) -> AsyncIterator[Any]:
+    """
+    read json lines from a stream, yield records one by one; arguments are same as `aiter_jsonl_batches`
+    """
+    async for batch in aiter_jsonl_batches(reader, cls=cls, chunk_size=chunk_size,
+                                           max_line_size=max_line_size, backend=backend):
+        for record in batch:
+            yield record
+
+def _aiter_jsonl_as(cls, reader, chunk_size: int = DEFAULT_CHUNK_SIZE, max_line_size: int = 1 << 24,
+                    backend: Optional[str] = None) -> AsyncIterator[Any]:
+    """
+    read json lines from an asyncio stream as instances of this class,
+    use as `async for record in cls.aiter_jsonl(reader)`
+    """
+    return aiter_jsonl(reader, cls=cls, chunk_size=chunk_size, max_line_size=max_line_size, backend=backend)
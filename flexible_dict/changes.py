@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+change tracking of json_object instances, changes are exported and applied as json merge patches (RFC 7386)
+"""
+
+from typing import Any, Dict, FrozenSet
+from collections.abc import Mapping
+from .utils import copy_as_builtin_json
+from .json_object import _FIELDS, _FIELD_DICTKEY, _CHANGES, _TRACK_CHANGES
+
+def _is_tracked(value) -> bool:
+    return getattr(type(value), _TRACK_CHANGES, False)
+
+def _is_dirty(value) -> bool:
+    if _is_tracked(value):
+        if value.__dict__.get(_CHANGES):
+            return True
+        return any(_is_dirty(v) for v in dict.values(value))
+    if isinstance(value, list):
+        # elements of a lazy list are not iterated, raw elements can not be changed by attribute access
+        return any(_is_dirty(v) for v in list.__iter__(value))
+    return False
+
+def changed_keys(self) -> FrozenSet[str]:
+    """
+    keys of fields set or deleted since construction or last `mark_clean()`, nested objects not included
+    """
+    return frozenset(self.__dict__.get(_CHANGES, ()))
+
+def mark_clean(self):
+    """
+    forget all changes of this object and nested objects
+    """
+    changes = self.__dict__.get(_CHANGES)
+    if changes:
+        changes.clear()
+    for value in dict.values(self):
+        if _is_tracked(value):
+            mark_clean(value)
+        elif isinstance(value, list):
+            for v in list.__iter__(value):
+                if _is_tracked(v):
+                    mark_clean(v)
+
+def diff(self) -> Dict[str, Any]:
+    """
+    changes since construction or last `mark_clean()` as a json merge patch:
+    a set field gives its value, a changed key which is absent is a deleted field and gives `None`,
+    a nested object gives its own patch, and a list containing a changed object is given as a whole.
+    A merge patch has no explicit `null`, so a field set to `None` gives `None` too and is deleted by `patch()`.
+    """
+    res = {}
+    changes = self.__dict__.get(_CHANGES, ())
+    for key in changes:
+        res[key] = copy_as_builtin_json(dict.__getitem__(self, key)) if key in self else None
+    for key, value in dict.items(self):
+        if key in changes:
+            continue
+        if _is_tracked(value):
+            sub = diff(value)
+            if sub:
+                res[key] = sub
+        elif isinstance(value, list) and _is_dirty(value):
+            res[key] = copy_as_builtin_json(value)
+    return res
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    apply a json merge patch to built-in json data, dicts in target are changed in place
+    """
+    if not isinstance(patch, Mapping):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
+
+def patch(self, delta: Mapping):
+    """
+    apply a json merge patch, fields are set and deleted by attribute access so the changes are tracked
+    """
+    fields = {f.key: f for f in getattr(self, _FIELDS).values() if f._field_type is _FIELD_DICTKEY}
+    changes = self.__dict__.setdefault(_CHANGES, set())
+    for key, value in delta.items():
+        f = fields.get(key)
+        current = dict.get(self, key)
+        if value is None:
+            if key not in self:
+                continue
+            if f is not None and f.deletable:
+                delattr(self, f.name)
+            else:
+                dict.pop(self, key)
+                changes.add(key)
+        elif isinstance(value, Mapping) and _is_tracked(current):
+            patch(current, value)
+        elif isinstance(value, Mapping) and isinstance(current, dict):
+            merge_patch(current, value)
+            changes.add(key)
+        elif f is not None and f.writeable:
+            setattr(self, f.name, value)
+        else:
+            dict.__setitem__(self, key, value)
+            changes.add(key)
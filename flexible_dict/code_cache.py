@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+persistent cache of compiled code for generated functions.
+
+There is one file for each function factory, named by the module of the class and keyed by
+a sha256 of the factory source and the library version, not by class qualname, field specs and config:
+encoders, defaults and keys are runtime objects bound when the factory is called, and the source
+already covers field names and the config dependent code paths, so it is the only stable key.
+Factories with the same source are shared by classes, and code generation still runs on a warm start,
+only compilation is skipped.
+"""
+
+from typing import Optional
+from types import CodeType
+import os
+import re
+import hashlib
+import marshal
+import importlib.util
+from .version import __version__
+
+# set this environment variable as a directory to enable the cache for all json_object classes
+ENV_CACHE_DIR = 'FLEXIBLE_DICT_CODE_CACHE_DIR'
+
+class CodeCache(object):
+    """
+    A directory storing compiled code of generated functions, works like `__pycache__`.
+    Code is keyed by its source and the library version, and stored with the magic number
+    of the python interpreter, so a stale or incompatible file is never used.
+    """
+    suffix = '.jocode'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls) -> Optional['CodeCache']:
+        """
+        create a cache if the directory is set by environment variable
+        """
+        directory = os.environ.get(ENV_CACHE_DIR)
+        if directory:
+            return cls(directory)
+        return None
+
+    @staticmethod
+    def get_key(source: str) -> str:
+        h = hashlib.sha256()
+        h.update(__version__.encode('utf-8'))
+        h.update(b'\0')
+        h.update(source.encode('utf-8'))
+        return h.hexdigest()
+
+    def get_path(self, name: str, key: str) -> str:
+        name = re.sub(r'[^\w.]', '_', name)
+        return os.path.join(self.directory, f"{name}.{key[:32]}{self.suffix}")
+
+    def load(self, name: str, key: str) -> Optional[CodeType]:
+        """
+        load code from the cache, return `None` if not found or invalid
+        """
+        try:
+            with open(self.get_path(name, key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            code = marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return code if isinstance(code, CodeType) else None
+
+    def store(self, name: str, key: str, code: CodeType):
+        """
+        save code to the cache; errors are ignored since the cache is only an optimization
+        """
+        path = self.get_path(name, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(importlib.util.MAGIC_NUMBER)
+                f.write(marshal.dumps(code))
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def compile(self, source: str, name: str) -> CodeType:
+        """
+        compile source as a module, or load the compiled code if cached
+        :param source:  source of the module
+        :param name:    a readable name for the code, e.g. module name of the class
+        """
+        key = self.get_key(source)
+        code = self.load(name, key)
+        if code is None:
+            code = compile(source, f"<json_object {name}>", 'exec')
+            self.store(name, key, code)
+        return code
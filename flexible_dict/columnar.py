@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+"""
+store a list of json objects as columns
+"""
+
+from typing import (
+    Any, Dict, Iterable, Iterator,
+    List, Mapping, Optional, Union,
+)
+from array import array
+import weakref
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from .adapter import NoneType, get_typing_args
+from .json_object import _FIELDS, _GETTERS, _FIELD_DICTKEY, Field
+
+# typecode of `array.array` for field types which can be stored in a typed column
+ARRAY_TYPECODES = {
+    int: 'q',
+    float: 'd',
+}
+# exact type of values stored in a typed column, others such as an int of a float field or a bool
+# would be converted by `array.array`
+_COLUMN_TYPES = {typecode: t for t, typecode in ARRAY_TYPECODES.items()}
+
+def get_array_typecode(a_type: Any) -> Optional[str]:
+    """
+    get typecode of `array.array` for a field type, `Optional[T]` is treated as `T`;
+    return `None` if values of the type should be stored in a list
+    """
+    if getattr(a_type, '__origin__', None) is Union:
+        args = [x for x in get_typing_args(a_type) if x is not NoneType]
+        if len(args) != 1:
+            return None
+        a_type = args[0]
+    return ARRAY_TYPECODES.get(a_type)
+
+# marks an absent key in a list column
+_ABSENT = object()
+
+class Row(object):
+    """
+    A lightweight view of a row in `ColumnTable`.
+    A subclass with a property for each field is created for each json_object class.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'ColumnTable', index: int):
+        self._table = table
+        self._index = index
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        build a dict with the values of the row, as the json_object instance stores
+        """
+        return self._table.get_row_dict(self._index)
+
+    def to_object(self):
+        """
+        build a json_object instance of the row
+        """
+        return self._table.cls(self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+_row_classes = weakref.WeakKeyDictionary()
+
+def _field_property(name: str) -> property:
+    def getter(row):
+        return row._table.get_value(name, row._index)
+
+    def setter(row, value):
+        row._table.set_value(name, row._index, value)
+
+    return property(getter, setter)
+
+def get_row_class(cls: type) -> type:
+    """
+    get the row view class for a json_object class
+    :raise TypeError:   if a field is named as an attribute of `Row`, e.g. `to_dict`
+    """
+    row_cls = _row_classes.get(cls)
+    if row_cls is None:
+        fields = getattr(cls, _FIELDS)
+        d = {'__slots__': ()}
+        for f in fields.values():
+            if f._field_type is not _FIELD_DICTKEY:
+                continue
+            if hasattr(Row, f.name):
+                raise TypeError(f"field '{f.name}' of {cls.__name__} conflicts with an attribute of Row")
+            d[f.name] = _field_property(f.name)
+        row_cls = _row_classes[cls] = type(f"{cls.__name__}Row", (Row,), d)
+    return row_cls
+
+class ColumnTable(object):
+    """
+    A struct-of-arrays collection of json_object records.
+    Each field is stored as a column: an `array.array` for int and float fields,
+    a list for others.  A typed column falls back to a list if a value of other type is given,
+    including an int of a float field and a bool of an int field, so values are kept as they are.
+    Keys which are not fields are kept in a list of dicts.
+    """
+    def __init__(self, cls: type, records: Iterable[Mapping[str, Any]] = ()):
+        """
+        :param cls:         a json_object class
+        :param records:     dicts of records, as the data of json_object instances
+        """
+        self.cls = cls
+        self.fields: List[Field] = [f for f in getattr(cls, _FIELDS).values() if f._field_type is _FIELD_DICTKEY]
+        self._getters = getattr(cls, _GETTERS)
+        self._keys = {f.key for f in self.fields}
+        self._fields_by_name = {f.name: f for f in self.fields}
+        self._decoders = {f.name: f.decoder for f in self.fields if callable(f.decoder)}
+        self._columns: Dict[str, Union[array, List[Any]]] = {}
+        # for a typed column, a flag for each row whether the key exists
+        self._present: Dict[str, bytearray] = {}
+        for f in self.fields:
+            typecode = get_array_typecode(f.type)
+            if typecode is None:
+                self._columns[f.name] = []
+            else:
+                self._columns[f.name] = array(typecode)
+                self._present[f.name] = bytearray()
+        self._extras: List[Optional[Dict[str, Any]]] = []
+        self._row_class = get_row_class(cls)
+        self.extend(records)
+
+    @classmethod
+    def from_list(cls, json_cls: type, li: Iterable[Mapping[str, Any]]) -> 'ColumnTable':
+        return cls(json_cls, li)
+
+    def __len__(self) -> int:
+        return len(self._extras)
+
+    def _to_list_column(self, name: str):
+        # a value can't be stored in the typed column
+        column = self._columns[name]
+        present = self._present.pop(name)
+        self._columns[name] = [v if p else _ABSENT for v, p in zip(column, present)]
+
+    def _store(self, name: str, index: Optional[int], value: Any):
+        column = self._columns[name]
+        present = self._present.get(name)
+        if present is not None:
+            if value is _ABSENT:
+                stored, flag = 0, 0
+            elif value.__class__ is not _COLUMN_TYPES[column.typecode]:
+                self._to_list_column(name)
+                return self._store(name, index, value)
+            else:
+                stored, flag = value, 1
+            try:
+                if index is None:
+                    column.append(stored)
+                else:
+                    column[index] = stored
+            except (TypeError, OverflowError):
+                self._to_list_column(name)
+                return self._store(name, index, value)
+            if index is None:
+                present.append(flag)
+            else:
+                present[index] = flag
+        elif index is None:
+            column.append(value)
+        else:
+            column[index] = value
+
+    def append(self, record: Mapping[str, Any]):
+        """
+        add a record, values are encoded as the json_object class does
+        """
+        for f in self.fields:
+            if f.key in record:
+                value = record[f.key]
+                if callable(f.encoder):
+                    value = f.encoder(value)
+            else:
+                value = _ABSENT
+            self._store(f.name, None, value)
+        extra = {k: v for k, v in record.items() if k not in self._keys}
+        self._extras.append(extra or None)
+
+    def extend(self, records: Iterable[Mapping[str, Any]]):
+        for record in records:
+            self.append(record)
+
+    def _get_stored(self, name: str, index: int) -> Any:
+        present = self._present.get(name)
+        if present is not None and not present[index]:
+            return _ABSENT
+        return self._columns[name][index]
+
+    def get_value(self, name: str, index: int) -> Any:
+        """
+        get a field value of a row, same as the field of a json_object instance
+        """
+        value = self._get_stored(name, index)
+        if value is _ABSENT:
+            # absent key, get the default as the json_object class does
+            return self._getters[name](self.get_row_dict(index))
+        decoder = self._decoders.get(name)
+        return value if decoder is None else decoder(value)
+
+    def set_value(self, name: str, index: int, value: Any):
+        f = self._fields_by_name[name]
+        if callable(f.encoder):
+            value = f.encoder(value)
+        self._store(name, index, value)
+
+    def get_row_dict(self, index: int) -> Dict[str, Any]:
+        """
+        build a dict of a row, keyed by dict keys
+        """
+        d = {}
+        for f in self.fields:
+            value = self._get_stored(f.name, index)
+            if value is not _ABSENT:
+                d[f.key] = value
+        extra = self._extras[index]
+        if extra:
+            d.update(extra)
+        return d
+
+    def column(self, name: str) -> Union[array, List[Any]]:
+        """
+        values of a field for all rows, absent values are replaced by the getter default;
+        if no value is absent, the stored column is returned without copy,
+        and a list is returned if a default can't be stored in the typed column, e.g. `None`
+        """
+        column = self._columns[name]
+        present = self._present.get(name)
+        if present is not None:
+            if all(present):
+                return column
+            res = array(column.typecode, column)
+            try:
+                for i, p in enumerate(present):
+                    if not p:
+                        res[i] = self.get_value(name, i)
+            except (TypeError, OverflowError):
+                return [v if p else self.get_value(name, i) for i, (v, p) in enumerate(zip(column, present))]
+            return res
+        if _ABSENT not in column:
+            return column
+        return [self.get_value(name, i) if v is _ABSENT else v for i, v in enumerate(column)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._row_class(self, index)
+
+    def __iter__(self) -> Iterator[Row]:
+        row_class = self._row_class
+        for i in range(len(self)):
+            yield row_class(self, i)
+
+    def to_list(self) -> List[Any]:
+        """
+        build json_object instances for all rows
+        """
+        return [row.to_object() for row in self]
+
+def extract_column(cls: type, records: Iterable[Mapping[str, Any]], name: str, dtype: Any = None) -> Any:
+    """
+    extract a field from a batch of records in a single pass,
+    the value of each record is read by the field getter, as `record.name` does
+    :param cls:         the json_object class
+    :param records:     json_object instances or dicts, or a `ColumnTable`
+    :param name:        field name
+    :param dtype:       dtype of the result; if not given, detected by the field type
+    :return:    a numpy array if numpy is installed;
+                else an `array.array` if dtype is an array typecode, or a list for other types;
+                if dtype is detected but a value can't be stored as it, e.g. `None` of an absent key,
+                an object array or a list is returned instead
+    """
+    fields = getattr(cls, _FIELDS)
+    if name not in fields:
+        raise ValueError(f"'{cls.__name__}' has no field '{name}'")
+    detected = dtype is None
+    if detected:
+        dtype = get_array_typecode(fields[name].type)
+    if isinstance(records, ColumnTable):
+        values = records.column(name)
+    else:
+        values = list(map(getattr(cls, _GETTERS)[name], records))
+
+    if numpy is not None:
+        if dtype is not None and numpy.dtype(dtype).kind != 'O':
+            try:
+                return numpy.fromiter(values, dtype=dtype, count=len(values))
+            except (TypeError, ValueError, OverflowError):
+                if not detected:
+                    raise
+        res = numpy.empty(len(values), dtype=object)
+        res[:] = values
+        return res
+    if dtype is None:
+        return list(values)
+    if not isinstance(dtype, str):
+        raise TypeError(f"dtype should be a typecode of array.array if numpy is not installed, got {dtype!r}")
+    try:
+        return array(dtype, values)
+    except (TypeError, OverflowError):
+        if not detected:
+            raise
+        return list(values)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+a compact base for json_object classes, store field values in slots instead of a hash table
+"""
+
+from typing import Any, Dict, Iterator
+from collections.abc import MutableMapping
+
+class CompactDict(MutableMapping):
+    """
+    Base of json_object classes created with `compact=True`.
+    Values of known fields are stored in slots, other keys are stored in an overflow dict
+    which is created only when needed.  It's not a dict, but a `MutableMapping`.
+    """
+    __slots__ = ('_overflow',)
+
+    # dict key -> slot descriptor, set for each compact class in field order
+    __json_object_slots__: Dict[str, Any] = {}
+
+    def _get_overflow(self) -> Dict[str, Any]:
+        try:
+            return _OVERFLOW.__get__(self)
+        except AttributeError:
+            return None
+
+    def __getitem__(self, key):
+        slot = self.__json_object_slots__.get(key)
+        if slot is not None:
+            try:
+                return slot.__get__(self)
+            except AttributeError:
+                raise KeyError(key) from None
+        overflow = self._get_overflow()
+        if overflow is None:
+            raise KeyError(key)
+        return overflow[key]
+
+    def __setitem__(self, key, value):
+        slot = self.__json_object_slots__.get(key)
+        if slot is not None:
+            slot.__set__(self, value)
+            return
+        overflow = self._get_overflow()
+        if overflow is None:
+            overflow = {}
+            _OVERFLOW.__set__(self, overflow)
+        overflow[key] = value
+
+    def __delitem__(self, key):
+        slot = self.__json_object_slots__.get(key)
+        if slot is not None:
+            try:
+                slot.__delete__(self)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        overflow = self._get_overflow()
+        if overflow is None:
+            raise KeyError(key)
+        del overflow[key]
+
+    def __contains__(self, key) -> bool:
+        slot = self.__json_object_slots__.get(key)
+        if slot is not None:
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                return False
+            return True
+        overflow = self._get_overflow()
+        return overflow is not None and key in overflow
+
+    def __iter__(self) -> Iterator[str]:
+        for key, slot in self.__json_object_slots__.items():
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                continue
+            yield key
+        overflow = self._get_overflow()
+        if overflow:
+            yield from overflow
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def copy(self):
+        """
+        a shallow copy of the same class
+        """
+        return _rebuild(type(self), self.items())
+
+    def __reduce__(self):
+        # Default pickling reads slots by attribute, which gives the getter default for an absent field.
+        return _rebuild, (type(self), list(self.items()))
+
+def _rebuild(cls, items) -> CompactDict:
+    res = cls.__new__(cls)
+    for key, value in items:
+        res[key] = value
+    return res
+
+_OVERFLOW = CompactDict.__dict__['_overflow']
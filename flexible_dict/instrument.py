@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+counters and sampled timings of generated functions, collected if a class is defined with `instrument=True`
+"""
+
+from typing import Any, Dict, Optional
+
+_STATS = '__json_object_stats__'
+
+class CallStats(object):
+    """
+    number of calls to a generated function, and total time of sampled calls
+    """
+    __slots__ = ('calls', 'sampled_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.sampled_time = 0.0
+
+    def reset(self):
+        self.calls = 0
+        self.sampled_time = 0.0
+
+class FieldStats(object):
+    """
+    stats of the getter and the setter of a field
+    """
+    __slots__ = ('reads', 'writes')
+
+    def __init__(self):
+        self.reads = CallStats()
+        self.writes = CallStats()
+
+    def reset(self):
+        self.reads.reset()
+        self.writes.reset()
+
+class ClassStats(object):
+    """
+    stats of generated functions of a json_object class
+    """
+    def __init__(self, name: str, sample_interval: int = 0):
+        """
+        :param name:            class name
+        :param sample_interval: one of every `sample_interval` calls is timed, no call is timed if 0
+        """
+        self.name = name
+        self.sample_interval = sample_interval
+        self.inits = CallStats()
+        self.fields: Dict[str, FieldStats] = {}
+
+    def get_field(self, name: str) -> FieldStats:
+        try:
+            return self.fields[name]
+        except KeyError:
+            stats = self.fields[name] = FieldStats()
+            return stats
+
+    def reset(self):
+        self.inits.reset()
+        for stats in self.fields.values():
+            stats.reset()
+
+    def _call_dict(self, stats: CallStats) -> Dict[str, Any]:
+        res = {'calls': stats.calls}
+        if self.sample_interval > 0:
+            samples = stats.calls // self.sample_interval
+            res['samples'] = samples
+            res['mean_time'] = stats.sampled_time / samples if samples else None
+        return res
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        stats as built-in data, mean times are in seconds
+        """
+        return {
+            'init': self._call_dict(self.inits),
+            'fields': {
+                name: {'reads': self._call_dict(stats.reads), 'writes': self._call_dict(stats.writes)}
+                for name, stats in self.fields.items()
+            },
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, {self.as_dict()!r})"
+
+def get_stats(cls) -> Optional[ClassStats]:
+    """
+    get stats of a json_object class, `None` if the class is not instrumented
+    """
+    if not isinstance(cls, type):
+        cls = type(cls)
+    for klass in cls.__mro__:
+        stats = klass.__dict__.get(_STATS)
+        if stats is not None:
+            return stats
+    return None
@@ -17,6 +17,7 @@
     from typing_extensions import Literal
 from types import FunctionType
 import sys
+import time
 import types
 import builtins
 import dataclasses
@@ -25,7 +26,13 @@
     get_encoder_func,
     get_decoder_func,
     AdapterDetector,
+    JsonArrayEncoder,
+    DEFAULT_ADAPTER_DETECTOR,
 )
+from .code_cache import CodeCache
+from .compact import CompactDict
+from .instrument import ClassStats, CallStats, _STATS
+from .validation import CheckExprBuilder, validation_error
 
 # A sentinel object for default values to signal that a default
 # factory will be used.  This is given a nice repr() which will appear
@@ -54,10 +61,28 @@ def __repr__(self):
 # objects.  Also used to check if a class is a json_object class.
 _FIELDS = '__json_object_fields__'
 
+# The name of an attribute on the class where we store the getter
+# functions of fields, keyed by field name.  A getter reads the value
+# from a dict, including the default for an absent key.
+_GETTERS = '__json_object_getters__'
+
+# The name of an instance attribute holding keys of fields set or deleted since last clean,
+# and the name of a class attribute marking the class tracks changes.
+_CHANGES = '__json_object_changes__'
+_TRACK_CHANGES = '__json_object_track_changes__'
+
+# The name of a class attribute holding names of helper methods added to the class.
+# A field of a subclass named as one of them overrides the inherited helper.
+_HELPERS = '__json_object_helpers__'
+
 # The name of the function, that if it exists, is called at the end of
 # __init__.
 _POST_INIT_NAME = '__post_init__'
 
+# The name of an attribute marking a generated __init__, which only stores
+# encoded field values and other keys in the dict.
+_GENERATED_INIT = '__json_object_generated__'
+
 @dataclasses.dataclass
 class Field:
     # the key stored in the dict; same as name if set as MISSING
@@ -84,6 +109,11 @@ class Field:
     encoder: Union[_ENCODER_TYPE, Literal['auto'], None] = 'auto'    # cast value type when write to dict
     decoder: Union[_DECODER_TYPE, None] = 'auto'    # cast value type when read from dict
 
+    # if set as true, a dict or list value given to __init__ is stored as it is,
+    # and encoded when the field is read at first time;
+    # if set as `None`, use the class config
+    lazy: Optional[bool] = None
+
     # if set as false, an exception will be raised when the key not exists
     check_exist_before_delete: bool = True
 
@@ -108,6 +138,7 @@ def field(
     getter_default_factory1: Callable[[dict], Any] = MISSING,
     encoder: Union[_ENCODER_TYPE, Literal['auto'], None] = 'auto',  # cast value type when write to dict
     decoder: Union[_DECODER_TYPE, None] = 'auto',  # cast value type when read from dict
+    lazy: Optional[bool] = None,
     check_exist_before_delete: bool = True,
     metadata: Dict[Any, Any] = None,
 ) -> Field:
@@ -123,10 +154,17 @@ def field(
         getter_default_factory1=getter_default_factory1,
         encoder=encoder,
         decoder=decoder,
+        lazy=lazy,
         check_exist_before_delete=check_exist_before_delete,
         metadata=metadata or {},
     )
 
+# Compiled function factories shared by all classes, keyed by module name and source.
+# Values are bound when a factory is called, so functions with same structure,
+# e.g. getters of fields without default, share one compiled code.
+_FACTORY_CACHE_SIZE = 4096
+_factories: Dict[Tuple[Optional[str], str], Callable[..., Any]] = {}
+
 class DefaultScope:
     GETTER = 1
     INIT = 2
@@ -140,18 +178,39 @@ class ProcessorConfig:
     # scope can be getter or init, and can all set active
     default_scopes: int = DefaultScope.GETTER
 
+    # encode dict or list values of fields on first read instead of in __init__,
+    # can be overwritten by `Field.lazy`
+    lazy: bool = False
+
     # auto set encoder and decoder for field
-    adapter_detector: AdapterDetector = dataclasses.field(default_factory=AdapterDetector)
+    adapter_detector: AdapterDetector = DEFAULT_ADAPTER_DETECTOR
+
+    # if set as true, the class is based on `CompactDict` instead of dict,
+    # field values are stored in slots and other keys in an overflow dict
+    compact: bool = False
+
+    # whether to install a property for each field on the class;
+    # if `False`, field values are only accessed through `__getattr__`
+    create_field_property: bool = True
 
     # whether to create a new __init__ function
     create_init_func: bool = True
 
+    # a cache to save compiled code of generated functions;
+    # by default, enabled if environment variable `FLEXIBLE_DICT_CODE_CACHE_DIR` is set
+    code_cache: Optional[CodeCache] = dataclasses.field(default_factory=CodeCache.from_env)
+
     # whether to create a function to iter all field values
     create_iter_func: bool = True
 
     # whether to create a new __init_subclass__ function
     create_init_subclass_func: bool = False
 
+    # whether to add helper methods, such as `column()`;
+    # a helper is not added if its name is used by a field, or defined by the class or its bases,
+    # and a field of a subclass named as an inherited helper overrides it
+    create_helper_funcs: bool = True
+
     # method name for field iter;
     # name can be 'items' therefor supper method wound be overwritten.
     iter_func_name: str = 'field_items'
@@ -159,8 +218,32 @@ class ProcessorConfig:
     # ignore not exists field for the new field iter function
     ignore_not_exists_filed_when_iter: bool = False
 
+    # if set as true, keys of fields set or deleted by attribute access are recorded in each instance,
+    # and methods `changed_keys()`, `mark_clean()`, `diff()` and `patch()` are added; not supported by compact
+    track_changes: bool = False
+
+    # if set as true, calls of generated getters, setters and `__init__` are counted,
+    # see `flexible_dict.get_stats()`; the generated code is not changed if `False`
+    instrument: bool = False
+
+    # if `instrument` is set and this is greater than 0, one of every n calls is timed
+    instrument_sample_interval: int = 0
+
+    # if set as true, values given to `__init__` and setters are checked against field annotations,
+    # `TypeError` is raised if not matched; nested json_object values are checked by their own classes
+    validate: bool = False
+
 DEFAULT_CONFIG = ProcessorConfig()
 
+def _is_inherited_helper(cls, name: str) -> bool:
+    """
+    whether `name` resolves to a helper method added by the processor to `cls` or its bases
+    """
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return name in klass.__dict__.get(_HELPERS, ())
+    return False
+
 class JsonObjectClassProcessor(object):
     """
     parse flexible_dict class, set property and function
@@ -212,9 +295,31 @@ def _create_fn(self, name: str, args: List[str], body: List[str], *,
         local_vars = ', '.join(_locals.keys())
         txt = f"def __create_fn__({local_vars}):\n{txt}\n return {name}"
 
+        factory = _factories.get((_globals.get('__name__'), txt))
+        if factory is None:
+            factory = self._compile_factory(txt, _globals, code_cache=self.config.code_cache)
+        return factory(**_locals)
+
+    @staticmethod
+    def _compile_factory(txt: str, _globals: Dict[str, Any],
+                         code_cache: CodeCache = None) -> Callable[..., Any]:
+        """
+        compile source of a function factory, and keep it for functions with same source
+        :param txt:         source of the factory
+        :param _globals:    globals of the factory
+        :param code_cache:  if given, load compiled code from the cache if possible
+        """
+        module_name = _globals.get('__name__')
         ns = {}
-        exec(txt, _globals, ns)
-        return ns['__create_fn__'](**_locals)
+        if code_cache is not None:
+            exec(code_cache.compile(txt, module_name or 'json_object'), _globals, ns)
+        else:
+            exec(txt, _globals, ns)
+        if len(_factories) >= _FACTORY_CACHE_SIZE:
+            # drop the oldest one
+            _factories.pop(next(iter(_factories)))
+        factory = _factories[(module_name, txt)] = ns['__create_fn__']
+        return factory
 
     @staticmethod
     def is_missing(value: Any) -> bool:
@@ -238,8 +343,9 @@ def get_field(self, cls, a_name, a_type) -> Field:
         if isinstance(default, Field):
             f = default
         else:
-            if isinstance(default, types.MemberDescriptorType):
-                # This is a field in __slots__, so it has no default value.
+            if isinstance(default, (types.MemberDescriptorType, property)) or _is_inherited_helper(cls, a_name):
+                # This is a field in __slots__, or a field re-declared in a subclass
+                # whose property or a helper of the same name is inherited, so it has no default value.
                 default = MISSING
             getter_default = init_default = MISSING
             if self.config.default_scopes & DefaultScope.GETTER:
@@ -305,12 +411,19 @@ def get_field(self, cls, a_name, a_type) -> Field:
                 raise ValueError(f'mutable init_default {type(f.init_default)} for field '
                                  f'{f.name} is not allowed: use init_default_factory')
 
+        if f.lazy is None:
+            f.lazy = self.config.lazy
+
         # if encoder/decoder set auto, detect whether an encoder/decoder is needed
         if f.encoder == 'auto':
             f.encoder = self.config.adapter_detector.detect_encoder(f.type)
         if f.decoder == 'auto':
             f.decoder = self.config.adapter_detector.detect_decoder(f.type)
 
+        # the getter of a lazy field encodes a value of exact type list, so an encoded list must be marked
+        if f.lazy and isinstance(f.encoder, JsonArrayEncoder) and not f.encoder.mark_encoded:
+            f.encoder = dataclasses.replace(f.encoder, mark_encoded=True)
+
         # in case some classes are both encoder and decoder,
         # and method __call__ not set properly,
         # specify encoder or decoder as the exact function
@@ -337,8 +450,61 @@ def _set_new_attribute(self, cls, name, value):
         setattr(cls, name, value)
         return False
 
+    def get_stats(self) -> ClassStats:
+        """
+        get stats of the class, only used if `instrument` is set
+        """
+        stats = self.cls.__dict__.get(_STATS)
+        if stats is None:
+            stats = ClassStats(self.cls.__name__, self.config.instrument_sample_interval)
+            self._set_new_attribute(self.cls, _STATS, stats)
+        return stats
+
+    def _instrument_lines(self, body_lines: List[str], _locals: Dict[str, Any], stats: CallStats,
+                          var_stats='_stats', var_start='_t0') -> List[str]:
+        """
+        count calls of the function, and time one of every `instrument_sample_interval` calls
+        """
+        _locals[var_stats] = stats
+        lines = [f"{var_stats}.calls += 1"]
+        interval = self.config.instrument_sample_interval
+        if interval <= 0:
+            return lines + body_lines
+        _locals['_perf_counter'] = time.perf_counter
+        lines.extend([
+            f"if {var_stats}.calls % {interval} == 0:",
+            f" {var_start} = _perf_counter()",
+            f" try:",
+        ])
+        lines.extend(f"  {line}" for line in body_lines)
+        lines.extend([
+            f" finally:",
+            f"  {var_stats}.sampled_time += _perf_counter() - {var_start}",
+            f"else:",
+        ])
+        lines.extend(f" {line}" for line in body_lines)
+        return lines
+
+    def _validate_lines(self, field: Field, var: str, _locals: Dict[str, Any], var_error='_validation_error',
+                        var_message='_message', prefix='_vt') -> List[str]:
+        """
+        lines to raise `TypeError` if value of the variable does not match the field type
+        """
+        expr = CheckExprBuilder(_locals, f'{prefix}_{field.name}_').build(field.type, var)
+        if expr is None:
+            return []
+        t = field.type
+        type_name = t.__qualname__ if isinstance(t, type) else repr(t).replace('typing.', '')
+        _locals[var_error] = validation_error
+        _locals[f'{var_message}_{field.name}'] = f"field '{field.name}' of {self.cls.__name__} expects {type_name}"
+        return [
+            f"if not {expr}:",
+            f" raise {var_error}({var_message}_{field.name}, {var})",
+        ]
+
     def build_getter(self, field: Field, *, method_name='getter', var_dict='_d', var_key='_key',
-                     var_decoder='_decoder', var_default='_default') -> Callable[[dict], Any]:
+                     var_decoder='_decoder', var_default='_default', var_encoder='_encoder',
+                     var_value='_v') -> Callable[[dict], Any]:
         _locals: dict = {
             var_key: field.key,
         }
@@ -347,6 +513,11 @@ def build_getter(self, field: Field, *, method_name='getter', var_dict='_d', var
         if should_decode:
             _locals[var_decoder] = field.decoder
 
+        # a lazy field may hold a raw dict or list, encode it and store back
+        should_encode = field.lazy and callable(field.encoder)
+        if should_encode:
+            _locals[var_encoder] = field.encoder
+
         if field.getter_default is not MISSING:
             default_type, default_value = 0, field.getter_default
         elif field.getter_default_factory0 is not MISSING:
@@ -358,17 +529,28 @@ def build_getter(self, field: Field, *, method_name='getter', var_dict='_d', var
         else:
             default_type, default_value = -2, None
 
-        def gen_body_lines() -> List[str]:
-            if default_type == -2:
-                # if no default defined, just get key value and decode
+        def gen_value_lines() -> List[str]:
+            if not should_encode:
                 if should_decode:
                     return [f"return {var_decoder}({var_dict}[{var_key}])"]
                 return [f"return {var_dict}[{var_key}]"]
-            lines = [f"if {var_key} in {var_dict}:"]
+            lines = [
+                f"{var_value} = {var_dict}[{var_key}]",
+                f"if {var_value}.__class__ is dict or {var_value}.__class__ is list:",
+                f" {var_value} = {var_dict}[{var_key}] = {var_encoder}({var_value})",
+            ]
             if should_decode:
-                lines.append(f" return {var_decoder}({var_dict}[{var_key}])")
+                lines.append(f"return {var_decoder}({var_value})")
             else:
-                lines.append(f" return {var_dict}[{var_key}]")
+                lines.append(f"return {var_value}")
+            return lines
+
+        def gen_body_lines() -> List[str]:
+            if default_type == -2:
+                # if no default defined, just get key value and decode
+                return gen_value_lines()
+            lines = [f"if {var_key} in {var_dict}:"]
+            lines.extend(f" {line}" for line in gen_value_lines())
             _locals[var_default] = default_value
             if default_type == 0:
                 lines.append(f"return {var_default}")
@@ -381,10 +563,13 @@ def gen_body_lines() -> List[str]:
 
         body_lines = gen_body_lines()
 
+        if self.config.instrument:
+            body_lines = self._instrument_lines(body_lines, _locals, self.get_stats().get_field(field.name).reads)
+
         return self._create_fn(method_name, [var_dict], body_lines, _locals=_locals)
 
     def build_setter(self, field: Field, *, method_name='setter', var_dict='_d', var_value='_value',
-                     var_key='_key', var_encoder='_encoder') -> Callable[[dict, Any], Any]:
+                     var_key='_key', var_encoder='_encoder', var_changes='_changes') -> Callable[[dict, Any], Any]:
         _locals: dict = {
             var_key: field.key,
         }
@@ -398,10 +583,30 @@ def build_setter(self, field: Field, *, method_name='setter', var_dict='_d', var
         else:
             body_lines = [f"{var_dict}[{var_key}] = {var_value}"]
 
+        if self.config.validate:
+            body_lines = self._validate_lines(field, var_value, _locals) + body_lines
+
+        if self.config.track_changes:
+            _locals[var_changes] = _CHANGES
+            body_lines.extend(self._record_change_lines(var_dict, var_key, var_changes))
+
+        if self.config.instrument:
+            body_lines = self._instrument_lines(body_lines, _locals, self.get_stats().get_field(field.name).writes)
+
         return self._create_fn(method_name, [var_dict, var_value], body_lines, _locals=_locals)
 
+    @staticmethod
+    def _record_change_lines(var_dict: str, var_key: str, var_changes: str) -> List[str]:
+        # the set of changed keys is created by the first change, not built again by every write
+        return [
+            "try:",
+            f" {var_dict}.__dict__[{var_changes}].add({var_key})",
+            "except KeyError:",
+            f" {var_dict}.__dict__[{var_changes}] = {{{var_key}}}",
+        ]
+
     def build_deleter(self, field: Field, *, method_name='deleter', var_dict='_d',
-                      var_key='_key') -> Callable[[dict], Any]:
+                      var_key='_key', var_changes='_changes') -> Callable[[dict], Any]:
         _locals: dict = {
             var_key: field.key,
         }
@@ -416,6 +621,11 @@ def build_deleter(self, field: Field, *, method_name='deleter', var_dict='_d',
                 f"{var_dict}.pop({var_key})",
             ]
 
+        if self.config.track_changes:
+            _locals[var_changes] = _CHANGES
+            indent = ' ' if field.check_exist_before_delete else ''
+            body_lines.extend(indent + line for line in self._record_change_lines(var_dict, var_key, var_changes))
+
         return self._create_fn(method_name, [var_dict], body_lines, _locals=_locals)
 
     def build_property(self, field: Field) -> property:
@@ -423,6 +633,29 @@ def build_property(self, field: Field) -> property:
                         fset=self.build_setter(field) if field.writeable else None,
                         fdel=self.build_deleter(field) if field.deletable else None)
 
+    def add_field_properties(self, helpers_only=False):
+        """
+        install a property for each field, so that reading a field is a normal attribute lookup
+        instead of a miss falling back to `__getattr__`
+        :param helpers_only:    if `True`, only install properties of fields named as an inherited helper,
+                                which would hide the field from `__getattr__`
+        """
+        cls = self.cls
+        for f in self.fields.values():
+            if f._field_type is not _FIELD_DICTKEY:
+                continue
+            if _is_inherited_helper(cls, f.name):
+                self._set_new_attribute(cls, f.name, self.build_property(f))
+                continue
+            if helpers_only:
+                continue
+            existing = getattr(cls, f.name, MISSING)
+            if existing is not MISSING and not isinstance(existing, property):
+                # The name is used by the class or its bases, e.g. a field named `keys`.
+                # Leave the method as it is, the field is still handled by `__getattr__`.
+                continue
+            self._set_new_attribute(cls, f.name, self.build_property(f))
+
     def add_base(self):
         """
         add dict as base if cls is not a subclass of dict
@@ -430,12 +663,50 @@ def add_base(self):
         cls = self.cls
         if not issubclass(cls, dict):
             d = dict(cls.__dict__)
-            d.pop('__dict__')
+            d.pop('__dict__', None)
             bases = tuple(b for b in cls.__bases__ if b != object) + (dict,)
             cls = type(cls.__name__, bases, d)
         self.cls = cls
         return cls
 
+    def add_compact_base(self):
+        """
+        rebuild cls with `CompactDict` as base, so that field values are stored in slots
+        """
+        cls = self.cls
+        if issubclass(cls, dict):
+            raise TypeError(f"compact json_object class {cls.__name__} cannot be a subclass of dict")
+
+        # dict key -> slot name
+        slots = {}
+        new_slots = []
+        for f in self.fields.values():
+            if f._field_type is not _FIELD_DICTKEY:
+                continue
+            # If the value can be returned as it is, name the slot same as the field,
+            # so that reading the field is a plain slot access.
+            plain = f.decoder is None and not (f.lazy and callable(f.encoder)) and not self.config.instrument
+            existing = getattr(cls, f.name, MISSING)
+            if plain and (existing is MISSING or isinstance(existing, types.MemberDescriptorType)):
+                name = f.name
+            else:
+                name = f'_slot_{f.name}'
+            if not any(name in b.__dict__ for b in cls.__mro__):
+                new_slots.append(name)
+            slots[f.key] = name
+
+        d = dict(cls.__dict__)
+        d.pop('__dict__', None)
+        d.pop('__weakref__', None)
+        d['__slots__'] = tuple(new_slots)
+        bases = tuple(b for b in cls.__bases__ if b is not object)
+        if not issubclass(cls, CompactDict):
+            bases += (CompactDict,)
+        cls = type(cls.__name__, bases, d)
+        cls.__json_object_slots__ = {key: getattr(cls, name) for key, name in slots.items()}
+        self.cls = cls
+        return cls
+
     def process_fields(self):
         """
         process fields in annotations as property
@@ -535,7 +806,8 @@ def _init_fn(self, fields: List[Field], self_name: str, has_post_init: bool, d_n
         # walk fields to update and encode
         for f in fields:
             if f._field_type is _FIELD_DICTKEY:
-                should_encode = callable(f.encoder)
+                # a lazy field is encoded by the getter when read
+                should_encode = callable(f.encoder) and not f.lazy
                 if should_encode:
                     _locals[f'_encoder_{f.name}'] = f.encoder
 
@@ -543,15 +815,21 @@ def _init_fn(self, fields: List[Field], self_name: str, has_post_init: bool, d_n
 
                 # if value given, stored in the dict
                 body_lines.append(f"if {f.name} is not MISSING:")
+                if self.config.validate:
+                    body_lines.extend(f" {line}" for line in self._validate_lines(f, f.name, _locals))
                 if should_encode:
                     body_lines.append(f" {f.name} = _encoder_{f.name}({f.name})")
                 body_lines.append(f" {self_name}[_key_{f.name}] = {f.name}")
 
                 # if value not given but key already in the dict, that means the values is passed in a dict
-                # encode the value if necessary
-                if should_encode:
+                # check and encode the value if necessary
+                check_lines = self._validate_lines(f, v_name, _locals) if self.config.validate else []
+                if should_encode or check_lines:
                     body_lines.append(f"elif _key_{f.name} in {self_name}:")
-                    body_lines.append(f" {self_name}[_key_{f.name}] = _encoder_{f.name}({self_name}[_key_{f.name}])")
+                    body_lines.append(f" {v_name} = {self_name}[_key_{f.name}]")
+                    body_lines.extend(f" {line}" for line in check_lines)
+                if should_encode:
+                    body_lines.append(f" {self_name}[_key_{f.name}] = _encoder_{f.name}({v_name})")
                     
                 # set default value
                 if not self.is_missing(f.init_default):
@@ -584,6 +862,9 @@ def _init_fn(self, fields: List[Field], self_name: str, has_post_init: bool, d_n
         if not body_lines:
             body_lines = ['pass']
 
+        if self.config.instrument:
+            body_lines = self._instrument_lines(body_lines, _locals, self.get_stats().inits)
+
         return self._create_fn('__init__', args, body_lines, _locals=_locals)
 
     def add_init_func(self):
@@ -592,14 +873,16 @@ def add_init_func(self):
         """
         fields = [f for f in self.fields.values() if f._field_type is _FIELD_DICTKEY]
         has_post_init = hasattr(self.cls, _POST_INIT_NAME)
-        self._set_new_attribute(self.cls, '__init__', self._init_fn(
+        init = self._init_fn(
             fields,
             'self',
             has_post_init,
             '_',
             '__',
             '___',
-        ))
+        )
+        if not self._set_new_attribute(self.cls, '__init__', init):
+            setattr(init, _GENERATED_INIT, True)
 
     def _init_subclass_func(self):
         _locals: dict = {
@@ -688,23 +971,28 @@ def add_iter_fields_func(self):
             self._set_new_attribute(self.cls, 'keys', self._iter_field_keys_fn('keys', 'self'))
             self._set_new_attribute(self.cls, 'values', self._iter_field_values_fn('values', 'self'))
 
-    def _getattr_fn(self, fields: List[Field], self_name='self', item_name='item', funcs_name='funcs'):
-        funcs = {f.name: self.build_getter(f) for f in fields}
+    def _getattr_fn(self, fields: List[Field], self_name='self', item_name='item', funcs_name='funcs',
+                    funcs: Dict[str, Callable[[dict], Any]] = None):
+        if funcs is None:
+            funcs = {f.name: self.build_getter(f) for f in fields}
         _locals = {
             funcs_name: funcs,
             'AttributeError': AttributeError,
+            '_class_name': self.cls.__name__,
         }
         args = [self_name, item_name]
         body_lines = [
             f"if {item_name} in {funcs_name}:",
             f" return {funcs_name}[{item_name}]({self_name})",
-            'raise AttributeError(f"' + f"'{self.cls.__name__}' object has no attribute " + "'{" + item_name + '}\'")',
+            'raise AttributeError(f"\'{_class_name}\' object has no attribute \'{' + item_name + '}\'")',
         ]
         return self._create_fn('__getattr__', args, body_lines, _locals=_locals)
 
     def add_getattr_func(self):
         fields = [f for f in self.fields.values() if f._field_type is _FIELD_DICTKEY]
-        self._set_new_attribute(self.cls, '__getattr__', self._getattr_fn(fields))
+        getters = {f.name: self.build_getter(f) for f in fields}
+        self._set_new_attribute(self.cls, _GETTERS, getters)
+        self._set_new_attribute(self.cls, '__getattr__', self._getattr_fn(fields, funcs=getters))
 
     def _getattribute_fn(self, fields: List[Field], self_name='self', item_name='item', funcs_name='funcs'):
         funcs = {f.name: self.build_getter(f) for f in fields}
@@ -729,12 +1017,13 @@ def _setattr_fn(self, fields: List[Field], self_name='self', key_name='key',
         _locals = {
             funcs_name: funcs,
             'super': super,
+            '_class_name': self.cls.__name__,
         }
         args = [self_name, key_name, value_name]
         body_lines = [
             f"if {key_name} in {funcs_name}:",
             f" return {funcs_name}[{key_name}]({self_name}, {value_name})",
-            'raise AttributeError(f"' + f"'{self.cls.__name__}' object has no attribute " + "'{" + key_name + '}\'")',
+            'raise AttributeError(f"\'{_class_name}\' object has no attribute \'{' + key_name + '}\'")',
             # f"return super().__setattr__({key_name}, {value_name})",
         ]
         return self._create_fn('__setattr__', args, body_lines, _locals=_locals)
@@ -751,8 +1040,8 @@ def _delattr_fn(self, fields: List[Field], self_name='self', item_name='item', f
         args = [self_name, item_name]
         body_lines = [
             f"if {item_name} in {funcs_name}:",
-            f" return {funcs_name}[{item_name}]({self_name}, {item_name})",
-            f"return super().__delattr__({item_name})",
+            f" return {funcs_name}[{item_name}]({self_name})",
+            f"return object.__delattr__({self_name}, {item_name})",
         ]
         return self._create_fn('__delattr__', args, body_lines, _locals=_locals)
 
@@ -760,10 +1049,53 @@ def add_delattr_func(self):
         fields = [f for f in self.fields.values() if f._field_type is _FIELD_DICTKEY]
         self._set_new_attribute(self.cls, '__delattr__', self._delattr_fn(fields))
 
+    def _helper_funcs(self) -> Dict[str, Any]:
+        from .columnar import extract_column
+        from .serialization import to_json, _loads_as, _load_as
+        from .snapshot import snapshot
+        from .aio import _aiter_jsonl_as
+        from .packing import pack, _unpack_as
+        return {
+            'column': classmethod(extract_column),
+            'to_json': to_json,
+            'loads': classmethod(_loads_as),
+            'load': classmethod(_load_as),
+            'snapshot': snapshot,
+            'aiter_jsonl': classmethod(_aiter_jsonl_as),
+            'pack': pack,
+            'unpack': classmethod(_unpack_as),
+        }
+
+    def add_helper_funcs(self):
+        """
+        add helper methods shared by all json_object classes
+        """
+        self._add_helpers(self._helper_funcs())
+
+    def _add_helpers(self, funcs: Dict[str, Any]):
+        # a method of the class or its bases is kept, helpers of json_object bases are inherited;
+        # names of added helpers are recorded, so that fields of subclasses can override them
+        added = set(self.cls.__dict__.get(_HELPERS, ()))
+        for name, func in funcs.items():
+            if name not in self.fields and not hasattr(self.cls, name):
+                self._set_new_attribute(self.cls, name, func)
+                added.add(name)
+        if added:
+            setattr(self.cls, _HELPERS, frozenset(added))
+
+    def add_change_tracking_funcs(self):
+        """
+        mark the class as tracking changes and add methods to export and apply changes
+        """
+        from .changes import changed_keys, mark_clean, diff, patch
+        self._set_new_attribute(self.cls, _TRACK_CHANGES, True)
+        self._add_helpers({'changed_keys': changed_keys, 'mark_clean': mark_clean, 'diff': diff, 'patch': patch})
+
     def add_class_methods(self):
         """
         add some class methods
         """
+        self.add_field_properties(helpers_only=not self.config.create_field_property)
         self.add_getattr_func()
         # self.add_getattribute_func()
         self.add_setattr_func()
@@ -778,6 +1110,12 @@ def add_class_methods(self):
         if self.config.create_iter_func:
             self.add_iter_fields_func()
 
+        if self.config.create_helper_funcs:
+            self.add_helper_funcs()
+
+        if self.config.track_changes:
+            self.add_change_tracking_funcs()
+
     def _process(self):
         """
         process pipeline
@@ -786,14 +1124,22 @@ def _process(self):
             raise ValueError("Class not given.")
 
         # if already processed, return directly
-        if getattr(self.cls, _FIELDS, None) is not None:
+        # the fields attribute may be inherited, so only check the class itself
+        if _FIELDS in self.cls.__dict__:
             return
 
-        # first, ensure the class be a subclass of dict
-        self.add_base()
+        if self.config.compact:
+            if self.config.track_changes:
+                raise TypeError(f"compact json_object class {self.cls.__name__} cannot track changes")
+            # slots are decided by fields, so process fields before building the class
+            self.process_fields()
+            self.add_compact_base()
+        else:
+            # first, ensure the class be a subclass of dict
+            self.add_base()
 
-        # then, process fields to access them in a flexible way
-        self.process_fields()
+            # then, process fields to access them in a flexible way
+            self.process_fields()
 
         # finally, add some flexible methods
         self.add_class_methods()
@@ -806,7 +1152,7 @@ def __call__(self, cls: type = None) -> Type[dict]:
 
 def json_object(_cls=None, processor=JsonObjectClassProcessor, *, config=None,
                 getter_default=None, adapter_detector: AdapterDetector = None,
-                create_init_func=True, create_init_subclass_func=False,
+                create_field_property=True, create_init_func=True, create_init_subclass_func=False,
                 create_iter_func=True, iter_func_name='field_items',
                 **kwargs):
     """
@@ -815,7 +1161,8 @@ def json_object(_cls=None, processor=JsonObjectClassProcessor, *, config=None,
     if config is None:
         config = ProcessorConfig(
             getter_default=getter_default,
-            adapter_detector=adapter_detector or AdapterDetector(),
+            adapter_detector=adapter_detector or DEFAULT_ADAPTER_DETECTOR,
+            create_field_property=create_field_property,
             create_init_func=create_init_func,
             create_init_subclass_func=create_init_subclass_func,
             create_iter_func=create_iter_func,
@@ -870,5 +1217,29 @@ def from_dict(cls, d: Dict[str, Any]) -> 'BaseDict':
         return cls(d)
 
     @classmethod
-    def from_list(cls, li: List[Dict[str, Any]]) -> List['BaseDict']:
+    def from_list(cls, li: List[Dict[str, Any]], workers: int = 0) -> List['BaseDict']:
+        """
+        :param workers: if greater than 1, build records in this number of processes,
+                        see `flexible_dict.parallel.from_list_parallel`
+        """
+        if workers > 1:
+            from .parallel import from_list_parallel
+            return from_list_parallel(cls, li, workers)
         return [cls.from_dict(x) for x in li]
+
+    @classmethod
+    def from_jsonl_parallel(cls, source: Union[str, Iterable[bytes]], workers: int,
+                            block_size: int = 1 << 20) -> List['BaseDict']:
+        """
+        parse and build records of a json lines file, or lines as bytes, in worker processes
+        """
+        from .parallel import from_jsonl_parallel
+        return from_jsonl_parallel(cls, source, workers, block_size=block_size)
+
+    @classmethod
+    def from_list_columnar(cls, li: Iterable[Dict[str, Any]]) -> 'ColumnTable':
+        """
+        store records as columns instead of building an instance for each of them
+        """
+        from .columnar import ColumnTable
+        return ColumnTable(cls, li)
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+"""
+a compact binary codec of json_object instances.
+Fields are encoded by position in the order of `__json_object_fields__`, so key names are not repeated.
+An object is encoded as a list `[mask, nested, *values, extra]`, where bit i of mask tells whether the i-th field is present,
+values are those of present fields, and `extra` is a dict of keys not defined as fields, omitted if empty.
+Values of fields typed as a json_object class, or a list of it, are encoded as such lists recursively,
+and bit i of nested tells whether the value of the i-th field is encoded so; a value not matching the type,
+e.g. a list for an object field, is stored as it is.
+A packed message starts with a format byte and a fingerprint of the schema, which is checked when unpacking.
+The tree of lists is serialized with msgpack if installed, or a tagged format built with the standard library.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from collections.abc import Mapping
+import hashlib
+import struct
+import weakref
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+from .adapter import get_typing_args, NoneType
+from .json_object import _FIELDS, _FIELD_DICTKEY
+
+FORMAT_STRUCT = 1
+FORMAT_MSGPACK = 2
+BACKENDS = {'struct': FORMAT_STRUCT, 'msgpack': FORMAT_MSGPACK}
+DEFAULT_BACKEND = 'msgpack' if msgpack is not None else 'struct'
+
+FINGERPRINT_SIZE = 8
+# version of the row layout, part of the fingerprint so data of another layout is rejected
+_ROW_VERSION = b'2'
+
+# kinds of fields
+_VALUE = 0
+_OBJECT = 1
+_OBJECT_LIST = 2
+
+_ABSENT = object()
+
+class _Schema(object):
+    __slots__ = ('key_set', 'fields', 'fingerprint')
+
+def _get_kind(t: Any) -> Tuple[int, Optional[type]]:
+    if getattr(t, '__origin__', None) is Union:
+        args = [x for x in get_typing_args(t) if x is not NoneType]
+        if len(args) != 1:
+            return _VALUE, None
+        t = args[0]
+    origin = getattr(t, '__origin__', None)
+    if origin is list or origin is List:
+        args = get_typing_args(t)
+        elem = args[0] if args else None
+        if isinstance(elem, type) and hasattr(elem, _FIELDS):
+            return _OBJECT_LIST, elem
+        return _VALUE, None
+    if isinstance(t, type) and hasattr(t, _FIELDS):
+        return _OBJECT, t
+    return _VALUE, None
+
+_schemas = weakref.WeakKeyDictionary()
+
+def _get_schema(cls: type, _building: Optional[set] = None) -> _Schema:
+    try:
+        return _schemas[cls]
+    except KeyError:
+        pass
+    if _building is None:
+        _building = set()
+    if cls in _building:
+        raise TypeError(f"can not pack recursive type {cls.__qualname__}")
+    _building.add(cls)
+    schema = _Schema()
+    fields = [f for f in getattr(cls, _FIELDS).values() if f._field_type is _FIELD_DICTKEY]
+    schema.key_set = frozenset(f.key for f in fields)
+    # (bit, key, kind, schema of the nested class) of each field
+    schema.fields = []
+    h = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    h.update(_ROW_VERSION)
+    for i, f in enumerate(fields):
+        kind, klass = _get_kind(f.type)
+        sub = None if klass is None else _get_schema(klass, _building)
+        schema.fields.append((1 << i, f.key, kind, sub))
+        h.update(f"{f.key}:{kind};".encode('utf-8'))
+        if sub is not None:
+            h.update(sub.fingerprint)
+    schema.fingerprint = h.digest()
+    _building.discard(cls)
+    _schemas[cls] = schema
+    return schema
+
+def schema_fingerprint(cls: type) -> bytes:
+    """
+    fingerprint of field keys and nested classes of a json_object class
+    """
+    return _get_schema(cls).fingerprint
+
+def _to_row(obj: Mapping, schema: _Schema) -> list:
+    if isinstance(obj, dict):
+        get = dict.get
+        items = dict.items(obj)
+    else:
+        # a field may be named as a method of Mapping
+        get = Mapping.get
+        items = Mapping.items(obj)
+    mask = nested = 0
+    row = [0, 0]
+    for bit, key, kind, sub in schema.fields:
+        value = get(obj, key, _ABSENT)
+        if value is _ABSENT:
+            continue
+        mask |= bit
+        if kind == _OBJECT and isinstance(value, Mapping):
+            value = _to_row(value, sub)
+            nested |= bit
+        elif kind == _OBJECT_LIST and isinstance(value, list):
+            # raw elements of a lazy list are read, so they are not converted
+            elems = list(list.__iter__(value))
+            if all(isinstance(x, Mapping) for x in elems):
+                value = [_to_row(x, sub) for x in elems]
+                nested |= bit
+        row.append(value)
+    row[0] = mask
+    row[1] = nested
+    if len(row) - 2 != len(obj):
+        extra = {k: v for k, v in items if k not in schema.key_set}
+        if extra:
+            row.append(extra)
+    return row
+
+def _from_row(row: list, schema: _Schema) -> Dict[str, Any]:
+    mask, nested = row[0], row[1]
+    d = {}
+    pos = 2
+    for bit, key, kind, sub in schema.fields:
+        if not mask & bit:
+            continue
+        value = row[pos]
+        pos += 1
+        if nested & bit:
+            if kind == _OBJECT:
+                value = _from_row(value, sub)
+            else:
+                value = [_from_row(x, sub) for x in value]
+        d[key] = value
+    if pos < len(row):
+        d.update(row[pos])
+    return d
+
+# tags of the standard library format
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3        # zigzag varint
+_FLOAT = 4      # little endian double
+_STR = 5        # varint length, utf-8 bytes
+_LIST = 6       # varint length, items
+_DICT = 7       # varint length, (varint length, utf-8 key bytes, value) pairs
+_BYTES = 8      # varint length, bytes
+_FIXSTR = 0x40  # 0x40 | n, utf-8 bytes of length n < 0x40
+_FIXINT = 0x80  # 0x80 | n for 0 <= n < 0x80
+
+_DOUBLE = struct.Struct('<d')
+
+def _write_varint(buf: bytearray, n: int):
+    while n >= 0x80:
+        buf.append(n & 0x7f | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _write(buf: bytearray, value: Any):
+    t = type(value)
+    if t is int:
+        if 0 <= value < 0x80:
+            buf.append(_FIXINT | value)
+        else:
+            buf.append(_INT)
+            _write_varint(buf, value << 1 if value >= 0 else (~value << 1) | 1)
+    elif t is str:
+        data = value.encode('utf-8')
+        if len(data) < 0x40:
+            buf.append(_FIXSTR | len(data))
+        else:
+            buf.append(_STR)
+            _write_varint(buf, len(data))
+        buf += data
+    elif value is None:
+        buf.append(_NONE)
+    elif t is bool:
+        buf.append(_TRUE if value else _FALSE)
+    elif t is float:
+        buf.append(_FLOAT)
+        buf += _DOUBLE.pack(value)
+    elif isinstance(value, (list, tuple)):
+        buf.append(_LIST)
+        _write_varint(buf, len(value))
+        for x in value:
+            _write(buf, x)
+    elif isinstance(value, Mapping):
+        buf.append(_DICT)
+        _write_varint(buf, len(value))
+        for k, v in (dict.items(value) if isinstance(value, dict) else Mapping.items(value)):
+            data = k.encode('utf-8')
+            _write_varint(buf, len(data))
+            buf += data
+            _write(buf, v)
+    elif isinstance(value, (bytes, bytearray)):
+        buf.append(_BYTES)
+        _write_varint(buf, len(value))
+        buf += value
+    elif isinstance(value, int):
+        _write(buf, int(value))
+    elif isinstance(value, float):
+        _write(buf, float(value))
+    elif isinstance(value, str):
+        _write(buf, str(value))
+    else:
+        raise TypeError(f"Object of type {t.__name__} can not be packed")
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+def _read(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag >= _FIXINT:
+        return tag & 0x7f, pos
+    if tag >= _FIXSTR:
+        end = pos + tag - _FIXSTR
+        return data[pos:end].decode('utf-8'), end
+    if tag == _STR:
+        size, pos = _read_varint(data, pos)
+        end = pos + size
+        return data[pos:end].decode('utf-8'), end
+    if tag == _LIST:
+        size, pos = _read_varint(data, pos)
+        res = []
+        for _ in range(size):
+            value, pos = _read(data, pos)
+            res.append(value)
+        return res, pos
+    if tag == _INT:
+        n, pos = _read_varint(data, pos)
+        return (~(n >> 1) if n & 1 else n >> 1), pos
+    if tag == _NONE:
+        return None, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if tag == _DICT:
+        size, pos = _read_varint(data, pos)
+        res = {}
+        for _ in range(size):
+            n, pos = _read_varint(data, pos)
+            end = pos + n
+            key = data[pos:end].decode('utf-8')
+            res[key], pos = _read(data, end)
+        return res, pos
+    if tag == _BYTES:
+        size, pos = _read_varint(data, pos)
+        end = pos + size
+        return data[pos:end], end
+    raise ValueError(f"unknown tag {tag} at {pos - 1}")
+
+def _dumps_struct(value: Any) -> bytes:
+    buf = bytearray()
+    _write(buf, value)
+    return bytes(buf)
+
+def _loads_struct(data: bytes) -> Any:
+    value, pos = _read(data, 0)
+    if pos != len(data):
+        raise ValueError(f"extra data at {pos}")
+    return value
+
+def _msgpack_default(obj: Any) -> Any:
+    # a mapping which is not a dict, e.g. a compact json_object nested in a value
+    if isinstance(obj, Mapping):
+        return dict(Mapping.items(obj))
+    raise TypeError(f"Object of type {type(obj).__name__} can not be packed")
+
+def _dumps_msgpack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_msgpack_default)
+
+def _get_codec(fmt: int) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if fmt == FORMAT_STRUCT:
+        return _dumps_struct, _loads_struct
+    if fmt != FORMAT_MSGPACK:
+        raise ValueError(f"unknown format {fmt}")
+    if msgpack is None:
+        raise ImportError("msgpack is required for this format")
+    return _dumps_msgpack, msgpack.unpackb
+
+def pack(obj: Mapping, cls: Optional[type] = None, backend: Optional[str] = None) -> bytes:
+    """
+    encode a json object as bytes
+    :param obj:     a json_object instance, or a mapping with the layout of `cls`
+    :param cls:     the json_object class, default to type of `obj`
+    :param backend: `msgpack` or `struct`, default to msgpack if installed
+    """
+    schema = _get_schema(type(obj) if cls is None else cls)
+    fmt = BACKENDS[backend or DEFAULT_BACKEND]
+    dumps, _ = _get_codec(fmt)
+    return bytes((fmt,)) + schema.fingerprint + dumps(_to_row(obj, schema))
+
+def unpack(data: bytes, cls: Type) -> Any:
+    """
+    decode bytes from `pack` as an instance of `cls`, the format is detected
+    :raise ValueError:  if the data is packed with another schema
+    """
+    schema = _get_schema(cls)
+    data = bytes(data)
+    if data[1:1 + FINGERPRINT_SIZE] != schema.fingerprint:
+        raise ValueError(f"data is not packed with the schema of {cls.__qualname__}")
+    _, loads = _get_codec(data[0])
+    return cls(_from_row(loads(data[1 + FINGERPRINT_SIZE:]), schema))
+
+def _unpack_as(cls, data: bytes) -> Any:
+    """
+    decode bytes from `pack()` as an instance of this class
+    """
+    return unpack(data, cls)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+build json objects in worker processes.
+Workers parse and construct records, and send them back as tuples of field values in field order
+with a presence mask, instead of pickled dicts with every key; the main process only rebuilds the containers.
+Classes must be importable by the workers, i.e. defined at module level.
+Instances of a class with a custom `__init__` or a `__post_init__` are constructed again in the main process
+from the values built by the workers, so that they are the same as built by the class.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+import itertools
+import multiprocessing
+from .serialization import get_parser
+from .json_object import _FIELDS, _FIELD_DICTKEY, _GENERATED_INIT, _POST_INIT_NAME
+
+# presence mask of fields, values of present fields in field order, keys not defined as fields
+_Row = Tuple[int, tuple, Optional[Dict[str, Any]]]
+
+def _get_keys(cls) -> List[str]:
+    return [f.key for f in getattr(cls, _FIELDS).values() if f._field_type is _FIELD_DICTKEY]
+
+def _to_row(obj, keys: List[str], key_set) -> _Row:
+    mask = 0
+    values = []
+    for i, key in enumerate(keys):
+        if key in obj:
+            mask |= 1 << i
+            values.append(obj[key])
+    items = dict.items(obj) if isinstance(obj, dict) else obj.items()
+    extra = {k: v for k, v in items if k not in key_set} or None
+    return mask, tuple(values), extra
+
+def _can_rebuild(cls) -> bool:
+    # an instance can be rebuilt without `__init__` only if it just stores the values
+    return getattr(cls.__init__, _GENERATED_INIT, False) and not hasattr(cls, _POST_INIT_NAME)
+
+def _from_row(cls, keys: List[str], row: _Row, rebuild: bool = True):
+    mask, values, extra = row
+    values = iter(values)
+    items = [(key, next(values)) for i, key in enumerate(keys) if mask >> i & 1]
+    if extra:
+        items.extend(extra.items())
+    if not rebuild:
+        return getattr(cls, 'from_dict', cls)(dict(items))
+    obj = cls.__new__(cls)
+    if isinstance(obj, dict):
+        dict.update(obj, items)
+    else:
+        for key, value in items:
+            obj[key] = value
+    return obj
+
+def _build_rows(job) -> List[_Row]:
+    cls, records, backend = job
+    if isinstance(records, bytes):
+        parse = get_parser(backend)
+        records = [parse(line) for line in records.split(b'\n') if line.strip()]
+    build = getattr(cls, 'from_dict', cls)
+    keys = _get_keys(cls)
+    key_set = frozenset(keys)
+    return [_to_row(build(d), keys, key_set) for d in records]
+
+def _run(cls, jobs: Iterable[Any], workers: int, backend: Optional[str]) -> Iterator[Any]:
+    keys = _get_keys(cls)
+    rebuild = _can_rebuild(cls)
+    with multiprocessing.Pool(workers) as pool:
+        for rows in pool.imap(_build_rows, ((cls, job, backend) for job in jobs)):
+            for row in rows:
+                yield _from_row(cls, keys, row, rebuild)
+
+def _chunks(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(iterable)
+    return iter(lambda: list(itertools.islice(it, size)), [])
+
+def from_list_parallel(cls: Type, records: Iterable[Dict[str, Any]], workers: int,
+                       chunk_size: int = 1000) -> List[Any]:
+    """
+    build instances of a json_object class from dicts in worker processes, order is kept;
+    only worth it if encoders are expensive, since dicts are pickled to the workers
+    :param cls:         a json_object class defined at module level
+    :param records:     dicts
+    :param workers:     number of worker processes
+    :param chunk_size:  number of records sent to a worker at a time
+    """
+    return list(_run(cls, _chunks(records, chunk_size), workers, None))
+
+def _iter_blocks(source: Union[str, Iterable[bytes]], block_size: int) -> Iterator[bytes]:
+    if not isinstance(source, str):
+        # lines, joined as blocks
+        size = 0
+        lines = []
+        for line in source:
+            lines.append(line if line.endswith(b'\n') else line + b'\n')
+            size += len(line)
+            if size >= block_size:
+                yield b''.join(lines)
+                size = 0
+                lines = []
+        if lines:
+            yield b''.join(lines)
+        return
+    with open(source, 'rb') as f:
+        # pieces of the last incomplete line, joined once a newline is read so a long line is copied once
+        pieces = []
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            end = block.rfind(b'\n') + 1
+            if not end:
+                pieces.append(block)
+                continue
+            pieces.append(block[:end])
+            yield b''.join(pieces)
+            pieces = [block[end:]] if end < len(block) else []
+        if pieces:
+            yield b''.join(pieces)
+
+def iter_jsonl_parallel(cls: Type, source: Union[str, Iterable[bytes]], workers: int,
+                        block_size: int = 1 << 20, backend: Optional[str] = None) -> Iterator[Any]:
+    """
+    build instances of a json_object class from json lines in worker processes, order is kept;
+    raw bytes are sent to the workers, which parse and construct the records
+    :param cls:         a json_object class defined at module level
+    :param source:      path of a json lines file, or lines as bytes
+    :param workers:     number of worker processes
+    :param block_size:  about how many bytes are sent to a worker at a time
+    :param backend:     json backend to parse lines, see `flexible_dict.serialization`
+    """
+    return _run(cls, _iter_blocks(source, block_size), workers, backend)
+
+def from_jsonl_parallel(cls: Type, source: Union[str, Iterable[bytes]], workers: int,
+                        block_size: int = 1 << 20, backend: Optional[str] = None) -> List[Any]:
+    """
+    same as `iter_jsonl_parallel`, but return a list
+    """
+    return list(iter_jsonl_parallel(cls, source, workers, block_size=block_size, backend=backend))
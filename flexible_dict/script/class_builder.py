@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from typing import (
-    List, Any, Dict, Set, Iterable,
+    List, Any, Dict, Set, Iterable, Iterator, TextIO, Callable, Optional, Union,
 )
 try:
     from typing import Literal
@@ -10,15 +10,21 @@
 import dataclasses
 import collections
 import json
+import io
+import itertools
 import re
+import sys
 import logging
 
 logger = logging.getLogger('__file__')
 
+_LINE_WORD = re.compile('_[a-z]+')
+_CAMEL_WORD_START = re.compile('(?<=[a-z])[A-Z]|(?<!^)[A-Z](?=[a-z])')
+
 def line2camel(name: str, capitalized=False) -> str:
     if not name:
         return name
-    contents = re.findall('_[a-z]+', name)
+    contents = _LINE_WORD.findall(name)
     for content in set(contents):
         name = name.replace(content, content[1:].title())
     if capitalized:
@@ -28,44 +34,121 @@ def line2camel(name: str, capitalized=False) -> str:
 def camel2line(name: str, upper=False) -> str:
     if not name:
         return name
-    name = re.sub('(?<=[a-z])[A-Z]|(?<!^)[A-Z](?=[a-z])', '_\\g<0>', name)
+    name = _CAMEL_WORD_START.sub('_\\g<0>', name)
     return name.upper() if upper else name.lower()
 
+@dataclasses.dataclass
+class TypeDef:
+    """
+    merged type of all values seen at the same place
+    each value is merged in O(1), element types of lists are merged over all elements
+    """
+    names: Dict[str, None] = dataclasses.field(default_factory=dict)    # type names in first seen order
+    nullable: bool = False
+    elem: 'TypeDef' = None      # element type if there are lists
+    def add(self, name: str) -> 'TypeDef':
+        self.names[name] = None
+        return self
+    def add_elem(self, elem: 'TypeDef') -> 'TypeDef':
+        if self.elem is None:
+            self.elem = TypeDef()
+        self.elem.merge(elem)
+        return self
+    def merge(self, other: 'TypeDef') -> 'TypeDef':
+        self.names.update(other.names)
+        self.nullable = self.nullable or other.nullable
+        if other.elem is not None:
+            self.add_elem(other.elem)
+        return self
+    def render(self, types: Set[str] = None, optional: bool = False) -> str:
+        """
+        render type annotation
+        :param types:       typing names used will be added
+        :param optional:    whether the value may be absent
+        """
+        if types is None:
+            types = set()
+        names = []
+        for name in self.names:
+            if name == 'int' and 'float' in self.names:
+                continue    # int is promoted to float
+            if name == 'list' and self.elem is not None and self.elem.names:
+                name = f"List[{self.elem.render(types)}]"
+                types.add('List')
+            names.append(name)
+        if not names:
+            types.add('Any')
+            return 'Any'
+        if len(names) == 1:
+            res = names[0]
+        else:
+            res = f"Union[{', '.join(names)}]"
+            types.add('Union')
+        if optional or self.nullable:
+            res = f"Optional[{res}]"
+            types.add('Optional')
+        return res
+    def __str__(self) -> str:
+        return self.render()
+
 @dataclasses.dataclass
 class FieldDef:
     name: str
-    type: str
+    type: TypeDef
     key: str = None
     default: str = None
+    count: int = 0      # number of samples with this field
 
 @dataclasses.dataclass
 class ClassDef:
     name: str
     _fields: List[FieldDef] = dataclasses.field(init=False, default_factory=list)
+    _index: Dict[str, int] = dataclasses.field(init=False, default_factory=dict, repr=False)  # field name -> index
+    count: int = dataclasses.field(init=False, default=0)   # number of samples
     @property
     def filed_num(self) -> int:
         return len(self._fields)
     @property
     def fields(self) -> Iterable[FieldDef]:
         return self._fields
-    def update_filed(self, name: str, v_type: str, key: str) -> int:
+    def is_optional(self, filed: FieldDef) -> bool:
+        """
+        whether the field is absent in some samples
+        """
+        return filed.count < self.count
+    def update_filed(self, name: str, v_type: Union[str, TypeDef], key: str, count: int = 1) -> int:
         """
         update a field definition
         :param name:    field name
-        :param v_type:  value type
+        :param v_type:  value type, merged into the type of the field
         :param key:     dict key
+        :param count:   number of samples with this field
         :return:    this field index in field list
         """
-        for i, filed in enumerate(self._fields):
-            filed: FieldDef
-            if filed.name == name:
-                if key != filed.key:
-                    logger.error(f"conflict key {filed.name} {filed.key} {key}")
-                if filed.type != v_type:
-                    logger.error(f"conflict value type {filed.name} {filed.type} {v_type}")
-                return i
-        self._fields.append(FieldDef(name, type=v_type, key=key))
-        return len(self._fields) - 1
+        if isinstance(v_type, str):
+            v_type = TypeDef().add(v_type)
+        i = self._index.get(name)
+        if i is not None:
+            filed = self._fields[i]
+            if key != filed.key:
+                logger.error(f"conflict key {filed.name} {filed.key} {key}")
+            filed.type.merge(v_type)
+            filed.count += count
+            return i
+        i = self._index[name] = len(self._fields)
+        self._fields.append(FieldDef(name, type=TypeDef().merge(v_type), key=key, count=count))
+        return i
+    def merge(self, other: 'ClassDef') -> 'ClassDef':
+        """
+        merge fields of another definition of the same class into this one
+        fields only in `other` are appended in their order
+        """
+        self.count += other.count
+        for filed in other.fields:
+            i = self.update_filed(name=filed.name, v_type=filed.type, key=filed.key, count=filed.count)
+            if self._fields[i].default is None:
+                self._fields[i].default = filed.default
+        return self
 
 NAME_STYLES = Literal['upper_camel', 'lower_camel', 'upper_line', 'lower_line', 'unchanged']
 NAME_FORMS = Literal['singular', 'plural', 'unchanged']
@@ -92,9 +175,14 @@ class ClassBuilder:
     # if `True`, inherit class `JsonObject` instead of using decorator `@json_object`
     inherit_json_object_class: bool = True
 
+    # max number of converted names to remember, 0 to disable
+    name_cache_size: int = 4096
+
     classes: Dict[str, ClassDef] = dataclasses.field(init=False, default_factory=collections.OrderedDict)
     types: Set[str] = dataclasses.field(init=False, default_factory=set)    # typing.xx which should be imported
     word_parser: Any = dataclasses.field(init=False, default=None)
+    # (name, style, form) -> converted name
+    _name_cache: Dict[tuple, str] = dataclasses.field(init=False, default_factory=collections.OrderedDict)
 
     # class var
     module = "flexible_dict"
@@ -106,6 +194,65 @@ def __post_init__(self):
         if isinstance(self.indent, int):
             self.indent = ' ' * self.indent
 
+    def __getstate__(self):
+        # the inflect engine is rebuilt on demand, do not send it to other processes
+        state = self.__dict__.copy()
+        state['word_parser'] = None
+        state['_name_cache'] = collections.OrderedDict()
+        return state
+
+    def get_options(self) -> Dict[str, Any]:
+        """
+        init arguments which can be used to create a builder with same settings
+        """
+        return {f.name: getattr(self, f.name) for f in dataclasses.fields(self) if f.init}
+
+    def merge(self, other: 'ClassBuilder') -> 'ClassBuilder':
+        """
+        merge classes built by another builder into this one
+        merging partial results of shards in order gives the same classes as building all records here
+        """
+        for name, cls in other.classes.items():
+            if name in self.classes:
+                self.classes[name].merge(cls)
+            else:
+                self.classes[name] = ClassDef(name).merge(cls)
+        self.types.update(other.types)
+        return self
+
+    def build_all(self, name: str, records: Iterable[Any], workers: int = 1, chunk_size: int = 1000,
+                  callback: Optional[Callable[[int], None]] = None) -> int:
+        """
+        build python class from many records
+        :param name:        class name
+        :param records:     dict values, or json text of dict values
+        :param workers:     number of worker processes, records are built in this process if less than 2
+        :param chunk_size:  number of records sent to a worker at a time
+        :param callback:    called with the number of processed records after each chunk
+        :return:    number of processed records
+        """
+        records = iter(records)
+        chunks = iter(lambda: list(itertools.islice(records, chunk_size)), [])
+        n = 0
+        if workers > 1:
+            import multiprocessing
+            options = self.get_options()
+            with multiprocessing.Pool(workers) as pool:
+                jobs = ((options, name, chunk) for chunk in chunks)
+                for builder, num in pool.imap(_build_chunk, jobs):
+                    self.merge(builder)
+                    n += num
+                    if callback:
+                        callback(n)
+        else:
+            for chunk in chunks:
+                for d in chunk:
+                    self.build(name, _load_record(d))
+                n += len(chunk)
+                if callback:
+                    callback(n)
+        return n
+
     def convert_word_form(self, word: str, form: Literal['singular', 'plural']) -> str:
         res = None
         if self.word_parser is None:
@@ -126,13 +273,35 @@ def get_plural_word(self, word: str) -> str:
 
     def get_singular_word(self, word: str) -> str:
         if word.endswith('_list'):
-            return word[-5:]
+            return word[:-5]
         if word.endswith('List'):
-            return word[-4:]
+            return word[:-4]
         return self.convert_word_form(word, form='singular')
 
     def get_name_by_style_and_form(self, name: str, style: NAME_STYLES = 'unchanged',
                                    form: NAME_FORMS = 'unchanged') -> str:
+        if style == 'unchanged' and form == 'unchanged':
+            return name
+        cache = self._name_cache
+        key = (name, style, form)
+        try:
+            res = cache[key]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(key)
+            return res
+        res = self.convert_name(name, style=style, form=form)
+        if self.name_cache_size > 0:
+            cache[key] = res
+            if len(cache) > self.name_cache_size:
+                cache.popitem(last=False)
+        return res
+
+    def convert_name(self, name: str, style: NAME_STYLES = 'unchanged', form: NAME_FORMS = 'unchanged') -> str:
+        """
+        convert name to the given style and form, results are cached by `get_name_by_style_and_form`
+        """
         if form == 'singular':
             name = self.get_singular_word(name)
         elif form == 'plural':
@@ -163,21 +332,31 @@ def gen_class_name(self, key: str) -> str:
         """
         return self.get_name_by_style_and_form(key, style=self.class_name_style, form=self.class_name_form)
 
-    def get_type(self, key: str, value: Any) -> str:
+    def get_type(self, key: str, value: Any) -> TypeDef:
         """
         get field value type base on json value
         this method may create new classes recursively
         """
+        type_def = TypeDef()
+        if value is None:
+            type_def.nullable = True
+            return type_def
         t = type(value)
-        type_name = t.__name__
         if t == dict and self.dict_as_class:
             type_name = self.gen_class_name(key)
             self.build(type_name, value)
-        elif t == list and value and value[0] and self.list_with_generic:
-            elem_type = self.get_type(self.get_singular_word(key), value[0])
-            type_name = f"List[{elem_type}]"
-            self.types.add('List')
-        return type_name
+            type_def.add(type_name)
+        elif t == list and self.list_with_generic:
+            type_def.add('list')
+            if value:
+                elem_key = self.get_name_by_style_and_form(key, form='singular')
+                elem = TypeDef()
+                for v in value:
+                    elem.merge(self.get_type(elem_key, v))
+                type_def.add_elem(elem)
+        else:
+            type_def.add(t.__name__)
+        return type_def
 
     def build(self, name: str, d: dict) -> ClassDef:
         """
@@ -189,6 +368,7 @@ def build(self, name: str, d: dict) -> ClassDef:
             cls = self.classes[name]
         else:
             cls = self.classes[name] = ClassDef(name)
+        cls.count += 1
         for key, value in d.items():
             v_type = self.get_type(key, value)
             field_name = self.gen_field_name(key, value=value)
@@ -207,7 +387,8 @@ def get_class_code_lines(self, cls: ClassDef) -> List[str]:
             ]
         if cls.filed_num > 0:
             for field in cls.fields:
-                line = f"{self.indent}{field.name}: {field.type}"
+                v_type = field.type.render(self.types, optional=cls.is_optional(field))
+                line = f"{self.indent}{field.name}: {v_type}"
                 if self.always_specify_key_explicitly or field.name != field.key:
                     args = {'key': field.key}
                     if field.default is not None:
@@ -225,7 +406,7 @@ def get_import_lines(self) -> List[str]:
 
         # elem should be imported in typing
         if self.types:
-            lines.append(f"from typing import {', '.join(self.types)}")
+            lines.append(f"from typing import {', '.join(sorted(self.types))}")
 
         # elem should be imported in this module
         cur_module = []
@@ -241,16 +422,127 @@ def get_import_lines(self) -> List[str]:
         return lines
 
     def get_code_text(self) -> str:
+        # typing names are collected while rendering classes
+        classes = ['\n'.join(self.get_class_code_lines(cls)) for cls in reversed(self.classes.values())]
         params = [
             '\n'.join(self.get_import_lines()),
-        ]
-        for cls in reversed(self.classes.values()):
-            params.append('\n'.join(self.get_class_code_lines(cls)))
+        ] + classes
         return '\n\n'.join(param for param in params if param) + "\n"
 
     def __str__(self) -> str:
         return self.get_code_text()
 
+def _load_record(d: Any) -> dict:
+    if isinstance(d, str):
+        d = json.loads(d)
+    assert isinstance(d, dict), d
+    return d
+
+# name caches of builders in a worker process, shared by all chunks with same options
+_worker_name_caches: Dict[tuple, Dict[tuple, str]] = {}
+
+def _build_chunk(job) -> 'tuple[ClassBuilder, int]':
+    options, name, records = job
+    builder = ClassBuilder(**options)
+    builder._name_cache = _worker_name_caches.setdefault(tuple(sorted(options.items())), builder._name_cache)
+    for d in records:
+        builder.build(name, _load_record(d))
+    return builder, len(records)
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_JSON_LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+def _is_truncated(e: json.JSONDecodeError) -> bool:
+    """
+    whether a decode error may be caused by the end of the text, so that more text may fix it
+    """
+    rest = e.doc[e.pos:]
+    if not rest.strip() or e.msg.startswith('Unterminated string'):
+        return True
+    if e.msg.startswith('Invalid \\uXXXX escape'):
+        return len(rest) < 6
+    # a literal cut at the end, e.g. `tr`
+    return any(x.startswith(rest) for x in _JSON_LITERALS)
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    iterate elements of a top-level json array without loading the whole document
+    only the current element and one chunk are kept in memory
+    a top-level value which is not an array is yielded as the only element
+    """
+    decoder = json.JSONDecoder()
+    buf, pos = '', 0
+
+    def more(size: int = 0) -> bool:
+        # read at least one chunk, or `size` characters, so a pending element is retried
+        # after its buffer doubles, and decoding a large element stays linear
+        nonlocal buf, pos
+        chunks = []
+        n = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            n += len(chunk)
+            if n >= size:
+                break
+        buf, pos = buf[pos:] + ''.join(chunks), 0
+        return bool(chunks)
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ''
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # the value may be cut at the chunk boundary, other errors are raised without reading further
+                if _is_truncated(e) and more(len(buf) - pos):
+                    continue
+                raise
+            # a number at the end of the buffer may be truncated
+            if end == len(buf) and more(len(buf) - pos):
+                continue
+            pos = end
+            return value
+
+    c = peek()
+    if not c:
+        return
+    if c != '[':
+        yield decode()
+        return
+    pos += 1
+    if peek() == ']':
+        return
+    while True:
+        yield decode()
+        c = peek()
+        if c == ']':
+            return
+        if c != ',':
+            raise ValueError(f"expect ',' or ']' in json array, got {c!r}")
+        pos += 1
+        peek()
+
+def iter_json_lines(f: TextIO) -> Iterator[Any]:
+    """
+    iterate values of a json lines file, blank lines are ignored
+    """
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
 def parse_args(args=None):
     import argparse
     parser = argparse.ArgumentParser('build_class')
@@ -259,6 +551,15 @@ def parse_args(args=None):
     g.add_argument('--str', default=None, help='json format string')
     g.add_argument('--file', default=None, help='a json format file')
     parser.add_argument('--encoding', default='utf-8', help='file encoding, default is utf-8')
+    parser.add_argument('--jsonl', default=False, action='store_true',
+                        help='input is json lines, each line is a record')
+    parser.add_argument('--stream', default=False, action='store_true',
+                        help='read elements of a top-level json array one by one instead of loading the whole file')
+    parser.add_argument('--progress', type=int, default=0,
+                        help='report the number of processed records to stderr every n records, 0 to disable')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes to infer classes, records are split into chunks among them')
+    parser.add_argument('--chunk_size', type=int, default=1000, help='number of records sent to a worker at a time')
     parser.add_argument('--output', default=None,
                         help='output file to save generated python code, print result on the console if not set')
     parser.add_argument('--indent', type=int, default=4, help='indent for python code')
@@ -287,22 +588,40 @@ def build_class_from_json(args=None):
     encoding = args.pop('encoding')
     content = args.pop('str')
 
+    jsonl = args.pop('jsonl')
+    stream = args.pop('stream')
+    progress = args.pop('progress')
+    workers = args.pop('workers')
+    chunk_size = args.pop('chunk_size')
+
     # get json value
-    if content:
-        data = json.loads(content)
-    else:
-        with open(input_file, encoding=encoding) as f:
+    f = io.StringIO(content) if content else open(input_file, encoding=encoding)
+    with f:
+        if jsonl:
+            # workers parse the lines themselves
+            data = (line for line in f if line.strip()) if workers > 1 else iter_json_lines(f)
+        elif stream:
+            data = iter_json_array(f)
+        else:
             data = json.load(f)
-    if isinstance(data, dict):
-        data = [data]
-    assert data, f"no data given"
-    assert isinstance(data, list), data
-    assert isinstance(data[0], dict), data
-
-    # build class
-    builder = ClassBuilder(**args)
-    for d in data:
-        builder.build(root_cls_name, d)
+            if isinstance(data, dict):
+                data = [data]
+            assert data, f"no data given"
+            assert isinstance(data, list), data
+
+        # build class
+        reported = 0
+        def report(num: int):
+            nonlocal reported
+            if num - reported >= progress:
+                reported = num
+                print(f"\r{num} records", end='', file=sys.stderr, flush=True)
+        builder = ClassBuilder(**args)
+        n = builder.build_all(root_cls_name, data, workers=workers, chunk_size=chunk_size,
+                              callback=report if progress else None)
+        if progress:
+            print(f"\r{n} records", file=sys.stderr, flush=True)
+        assert n, f"no data given"
     code = builder.get_code_text()
 
     # save or print
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+serialize json objects to json text directly, without copying them as built-in data first,
+and parse json text as json objects
+"""
+
+from typing import Any, Optional, IO, Union, Type, Callable
+from collections.abc import Mapping
+import io
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# the fastest available backend is used by default
+BACKENDS = tuple(name for name, module in (('orjson', orjson), ('ujson', ujson), ('json', json)) if module)
+DEFAULT_BACKEND = BACKENDS[0]
+
+def _default(obj):
+    # values which are not dict or list, e.g. a compact json_object or a tuple subclass
+    if isinstance(obj, Mapping):
+        return dict(obj.items())
+    if isinstance(obj, (tuple, set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+def _get_backend(backend: Optional[str], indent: Optional[int]) -> str:
+    if backend is None:
+        backend = DEFAULT_BACKEND
+        # orjson only supports an indent of 2 spaces
+        if backend == 'orjson' and indent not in (None, 2):
+            backend = BACKENDS[1]
+    elif backend not in BACKENDS:
+        raise ValueError(f"Unavailable json backend: {backend}")
+    return backend
+
+def _dumps_json(obj: Any, sort_keys: bool, indent: Optional[int]) -> str:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, indent=indent,
+                      separators=(',', ':') if indent is None else None, default=_default)
+
+# errors of faster backends on data accepted by `json`, e.g. non-str keys and integers beyond 64 bits,
+# which are serialized again by `json` so the result does not depend on the backend
+_FALLBACK_ERRORS = (TypeError, OverflowError)
+
+def dumpb(obj: Any, sort_keys: bool = False, indent: Optional[int] = None, backend: Optional[str] = None) -> bytes:
+    """
+    serialize a json object as utf-8 encoded json text
+    :param obj:         json object, or any built-in json data
+    :param sort_keys:   whether to sort keys of objects
+    :param indent:      indent of nested values, the result is compact if `None`
+    :param backend:     one of `BACKENDS`, the fastest one is used if not set
+    """
+    backend = _get_backend(backend, indent)
+    if backend == 'orjson':
+        option = 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if indent is not None and indent != 2:
+            raise ValueError(f"orjson only supports indent 2, got {indent}")
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except _FALLBACK_ERRORS:
+            return _dumps_json(obj, sort_keys, indent).encode('utf-8')
+    return dumps(obj, sort_keys=sort_keys, indent=indent, backend=backend).encode('utf-8')
+
+def dumps(obj: Any, sort_keys: bool = False, indent: Optional[int] = None, backend: Optional[str] = None) -> str:
+    """
+    serialize a json object as json text
+    arguments are same as `dumpb`
+    """
+    backend = _get_backend(backend, indent)
+    if backend == 'orjson':
+        return dumpb(obj, sort_keys=sort_keys, indent=indent, backend=backend).decode('utf-8')
+    if backend == 'ujson':
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                               sort_keys=sort_keys, indent=indent or 0, default=_default)
+        except _FALLBACK_ERRORS:
+            pass
+    return _dumps_json(obj, sort_keys, indent)
+
+def dump(obj: Any, fp: IO, sort_keys: bool = False, indent: Optional[int] = None,
+         backend: Optional[str] = None):
+    """
+    serialize a json object to a text or binary stream
+    other arguments are same as `dumpb`
+    """
+    backend = _get_backend(backend, indent)
+    if isinstance(fp, io.TextIOBase):
+        if backend == 'json':
+            # write chunks instead of building the whole text
+            json.dump(obj, fp, ensure_ascii=False, sort_keys=sort_keys, indent=indent,
+                      separators=(',', ':') if indent is None else None, default=_default)
+        else:
+            fp.write(dumps(obj, sort_keys=sort_keys, indent=indent, backend=backend))
+    else:
+        fp.write(dumpb(obj, sort_keys=sort_keys, indent=indent, backend=backend))
+
+def to_json(self, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+    """
+    serialize this object as json text
+    """
+    return dumps(self, sort_keys=sort_keys, indent=indent)
+
+def get_parser(backend: Optional[str] = None) -> Callable[[Union[str, bytes]], Any]:
+    """
+    get the function to parse json text of a backend, the fastest one is used if not set
+    """
+    backend = _get_backend(backend, None)
+    if backend == 'orjson':
+        return orjson.loads
+    if backend == 'ujson':
+        return ujson.loads
+    return json.loads
+
+def loads(s: Union[str, bytes], cls: Optional[Type] = None, backend: Optional[str] = None) -> Any:
+    """
+    parse json text by the fastest available backend, then convert the result by the constructor of `cls`;
+    this is a parse into built-in values followed by a walk of the fields, instances are not built inside the parser
+    :param s:       json text
+    :param cls:     a json_object class; if given, a top-level object is returned as an instance of it,
+                    and so is each element of a top-level array
+    :param backend: one of `BACKENDS`, the fastest one is used if not set
+    """
+    data = get_parser(backend)(s)
+    if cls is None:
+        return data
+    # nested values are converted by encoders of the fields
+    if isinstance(data, list):
+        return [cls(x) for x in data]
+    return cls(data)
+
+def load(fp: IO, cls: Optional[Type] = None, backend: Optional[str] = None) -> Any:
+    """
+    parse json text from a text or binary stream
+    other arguments are same as `loads`
+    """
+    return loads(fp.read(), cls=cls, backend=backend)
+
+def _loads_as(cls, s: Union[str, bytes], backend: Optional[str] = None):
+    """
+    parse json text as an instance of this class, or a list of instances for a top-level array
+    """
+    return loads(s, cls=cls, backend=backend)
+
+def _load_as(cls, fp: IO, backend: Optional[str] = None):
+    """
+    same as `loads`, but read json text from a text or binary stream
+    """
+    return load(fp, cls=cls, backend=backend)
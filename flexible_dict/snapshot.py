@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+copy-on-write snapshots of json object trees
+"""
+
+from typing import Any, Dict
+from collections.abc import Mapping
+import weakref
+from .utils import copy_as_builtin_json
+
+_FIELDS = '__json_object_fields__'
+_CHANGES = '__json_object_changes__'
+_OWNER = '_cow_owner'
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+class _CowDictMixin(object):
+    """
+    methods of a snapshot dict, a nested container is made private to the snapshot before returned
+    """
+    __slots__ = ()
+    _cow_lazy_encoders: Dict[str, Any] = {}
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if value.__class__ in _SCALAR_TYPES:
+            return value
+        if value.__class__ is dict or value.__class__ is list:
+            # the raw value of a lazy field, encode it as the getter does before it is made private
+            encoder = self._cow_lazy_encoders.get(key)
+            if encoder is not None:
+                value = encoder(value)
+        private = _privatize(value, getattr(self, _OWNER))
+        if private is not value:
+            dict.__setitem__(self, key, private)
+        return private
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        return super().setdefault(key, default)
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            super().pop(key)
+            return value
+        return super().pop(key, *args)
+
+    def popitem(self):
+        # put the last item back, so that it is read as by `pop`
+        key, value = super().popitem()
+        dict.__setitem__(self, key, value)
+        return key, self.pop(key)
+
+    def __iter__(self):
+        # Not the C slot of dict, so that `dict(snap)` and `{**snap}` read values by `__getitem__`
+        # instead of copying the shared ones directly.
+        return dict.__iter__(self)
+
+    def _privatize_all(self):
+        for key in list(dict.__iter__(self)):
+            self[key]
+
+    def values(self):
+        self._privatize_all()
+        return super().values()
+
+    def items(self):
+        self._privatize_all()
+        return super().items()
+
+    def copy(self):
+        return snapshot(self)
+
+class _CowListMixin(object):
+    """
+    methods of a snapshot list, a nested container is made private to the snapshot before returned
+    """
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = super().__getitem__(index)
+        if value.__class__ in _SCALAR_TYPES:
+            return value
+        private = _privatize(value, getattr(self, _OWNER))
+        if private is not value:
+            list.__setitem__(self, index, private)
+        return private
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def pop(self, index=-1):
+        value = self[index]
+        super().pop(index)
+        return value
+
+    def copy(self):
+        return snapshot(self)
+
+_cow_classes: 'weakref.WeakKeyDictionary[type, type]' = weakref.WeakKeyDictionary()
+
+def get_cow_class(cls: type) -> type:
+    """
+    get the snapshot class of a dict or list class, which is a subclass with the same name
+    """
+    if '_cow_base' in cls.__dict__:
+        return cls
+    try:
+        return _cow_classes[cls]
+    except KeyError:
+        pass
+    mixin = _CowListMixin if issubclass(cls, list) else _CowDictMixin
+    namespace: Dict[str, Any] = {
+        '__slots__': (_OWNER,),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '_cow_base': cls,
+    }
+    if _FIELDS in getattr(cls, '__dict__', {}):
+        # already processed, do not process the subclass again by `__init_subclass__`
+        namespace[_FIELDS] = getattr(cls, _FIELDS)
+    fields = getattr(cls, _FIELDS, {})
+    if any(f.lazy for f in fields.values()):
+        namespace['_cow_lazy_encoders'] = {f.key: f.encoder for f in fields.values()
+                                           if f.lazy and callable(f.encoder)}
+    cow_cls = _cow_classes[cls] = type(cls.__name__, (mixin, cls), namespace)
+    return cow_cls
+
+def _copy_slots(src, dst):
+    for klass in type(src).__mro__:
+        for name in klass.__dict__.get('__slots__', ()):
+            if name != _OWNER and not name.startswith('__') and hasattr(src, name):
+                object.__setattr__(dst, name, getattr(src, name))
+
+def _privatize(value, owner):
+    if getattr(value, _OWNER, None) is owner:
+        return value
+    if isinstance(value, dict):
+        cow_cls = get_cow_class(type(value))
+        private = cow_cls.__new__(cow_cls)
+        dict.update(private, value)
+    elif isinstance(value, list):
+        cow_cls = get_cow_class(type(value))
+        private = cow_cls.__new__(cow_cls)
+        list.extend(private, list.__iter__(value))
+    elif isinstance(value, Mapping):
+        # e.g. a compact json_object, whose fields are not read by item access, copy it in full
+        return type(value)(copy_as_builtin_json(value))
+    else:
+        return value
+    _copy_slots(value, private)
+    if hasattr(value, '__dict__'):
+        private.__dict__.update(value.__dict__)
+        if _CHANGES in private.__dict__:
+            # changes are recorded separately since then
+            private.__dict__[_CHANGES] = set(private.__dict__[_CHANGES])
+    object.__setattr__(private, _OWNER, owner)
+    return private
+
+def _copy_owned(value, src_owner, owner):
+    # Values private to `src_owner` may still be changed through it, so they are copied for `owner` as well,
+    # while values shared with the original object stay shared until they are read.
+    private = _privatize(value, owner)
+    if isinstance(private, dict):
+        for k, v in dict.items(private):
+            if getattr(v, _OWNER, None) is src_owner:
+                dict.__setitem__(private, k, _copy_owned(v, src_owner, owner))
+    elif isinstance(private, list):
+        for i, v in enumerate(list.__iter__(private)):
+            if getattr(v, _OWNER, None) is src_owner:
+                list.__setitem__(private, i, _copy_owned(v, src_owner, owner))
+    return private
+
+def snapshot(obj):
+    """
+    create a copy-on-write snapshot of a json object, or a dict or list of json values.
+    Only the top level is copied at first; a nested dict or list is copied one level when it is read
+    by item access, `get`, `pop`, iteration of lists or a field, so the cost grows with the visited path
+    instead of the whole tree; `items()` and `values()` of a snapshot dict copy all its nested values one level,
+    and so do `dict(snap)`, `{**snap}` and `copy()`, the supported ways to export a snapshot.
+    Changes made through the snapshot never affect the original object,
+    while the original object should not be changed as long as the snapshot is in use.
+    Unbound methods of dict and list, e.g. `dict.items(snap)`, and C serializers such as orjson read shared values,
+    which is fine for reading but they should not be changed.
+    """
+    src_owner = getattr(obj, _OWNER, None)
+    if src_owner is None:
+        return _privatize(obj, object())
+    # a snapshot of a snapshot, e.g. by `copy()`
+    return _copy_owned(obj, src_owner, object())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+random access to records of a json lines file by a line offset index, the file is memory mapped
+"""
+
+from typing import Any, Iterator, List, Optional, Type, Union
+from array import array
+import hashlib
+import mmap
+import os
+from .serialization import get_parser
+
+# typecode of offsets, unsigned 64 bits
+_TYPECODE = 'Q'
+_BLANK = b' \t\r\n'
+
+# an index file starts with a header of `_TYPECODE` items:
+# magic, device and inode of the file, its mtime in ns and size when saved, size covered by the index,
+# and a hash of the head and the tail of the covered bytes; offsets of lines follow
+_INDEX_MAGIC = int.from_bytes(b'FDJLIDX1', 'little')
+_HEADER_SIZE = 7
+# bytes hashed at each end of the indexed part of the file
+_HASH_SIZE = 1 << 16
+
+def build_line_index(buf, start: int = 0, end: Optional[int] = None) -> array:
+    """
+    find start offsets of non-blank lines in a buffer
+    :param buf:     bytes, mmap or any object with `find` and indexing as bytes
+    :param start:   offset to start scanning, should be the start of a line
+    :param end:     offset to stop scanning, default to the end of the buffer
+    """
+    if end is None:
+        end = len(buf)
+    offsets = array(_TYPECODE)
+    pos = start
+    while pos < end:
+        stop = buf.find(b'\n', pos, end)
+        if stop < 0:
+            stop = end
+        if buf[pos] not in _BLANK or buf[pos:stop].strip():
+            offsets.append(pos)
+        pos = stop + 1
+    return offsets
+
+class JsonLinesStore(object):
+    """
+    Records of a json lines file, `store[i]` and `store[a:b]` parse only the bytes of requested lines.
+    The line index can be persisted to a file, and is extended for lines appended since it was built.
+    """
+    def __init__(self, path: str, cls: Optional[Type] = None, index_path: Optional[str] = None,
+                 backend: Optional[str] = None):
+        """
+        :param path:        path of the json lines file
+        :param cls:         a json_object class; if given, records are returned as instances of it
+        :param index_path:  file to load the index from and save it to;
+                            the index is rebuilt if missing, or if the file was replaced or rewritten
+        :param backend:     json backend to parse lines, see `flexible_dict.serialization`
+        """
+        self.path = path
+        self.cls = cls
+        self.index_path = index_path
+        self._parse = get_parser(backend)
+        self._file = open(path, 'rb')
+        self._mm = None
+        self._size = 0
+        # offsets of lines, and size of the file covered by complete lines of the index
+        self._offsets = array(_TYPECODE)
+        self._indexed = 0
+        if index_path is not None:
+            self._load_index()
+        self.refresh()
+
+    def _hash_indexed(self, indexed: int) -> int:
+        h = hashlib.blake2b(digest_size=8)
+        h.update(indexed.to_bytes(8, 'little'))
+        self._file.seek(0)
+        h.update(self._file.read(min(indexed, _HASH_SIZE)))
+        if indexed > _HASH_SIZE:
+            start = max(_HASH_SIZE, indexed - _HASH_SIZE)
+            self._file.seek(start)
+            h.update(self._file.read(indexed - start))
+        return int.from_bytes(h.digest(), 'little')
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        index = array(_TYPECODE)
+        try:
+            index.frombytes(data)
+        except ValueError:
+            # a truncated index file
+            return
+        if len(index) < _HEADER_SIZE or index[0] != _INDEX_MAGIC:
+            # not an index, or of an older format
+            return
+        st = os.fstat(self._file.fileno())
+        dev, ino, mtime, size, indexed, digest = index[1:_HEADER_SIZE]
+        if (dev, ino) != (st.st_dev, st.st_ino) or indexed > st.st_size:
+            # the file is replaced
+            return
+        if (mtime, size) != (st.st_mtime_ns, st.st_size) and digest != self._hash_indexed(indexed):
+            # the file is changed other than appended to
+            return
+        self._indexed = indexed
+        self._offsets = index[_HEADER_SIZE:]
+
+    def save_index(self, index_path: Optional[str] = None):
+        """
+        write the index to `index_path`, default to the one given at construction
+        """
+        index_path = index_path or self.index_path
+        if index_path is None:
+            raise ValueError("no index path")
+        st = os.fstat(self._file.fileno())
+        index = array(_TYPECODE, [_INDEX_MAGIC, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size,
+                                  self._indexed, self._hash_indexed(self._indexed)])
+        index.extend(self._offsets)
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            index.tofile(f)
+        os.replace(tmp_path, index_path)
+
+    def refresh(self) -> int:
+        """
+        map the file again and index lines appended since last time,
+        the index is saved if `index_path` is given and it changes
+        :return:    number of records
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._size and self._mm is not None:
+            return len(self._offsets)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if size < self._indexed:
+            # the file is truncated, index it from the start
+            self._offsets = array(_TYPECODE)
+            self._indexed = 0
+        self._size = size
+        if size == 0:
+            return len(self._offsets)
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # drop a line indexed before its newline was written
+        while self._offsets and self._offsets[-1] >= self._indexed:
+            self._offsets.pop()
+        offsets = build_line_index(self._mm, self._indexed, size)
+        self._offsets.extend(offsets)
+        indexed = self._mm.rfind(b'\n', self._indexed, size) + 1
+        if indexed:
+            self._indexed = indexed
+        if offsets and self.index_path is not None:
+            self.save_index()
+        return len(self._offsets)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> 'JsonLinesStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def get_line(self, i: int) -> bytes:
+        """
+        raw bytes of the i-th record, without the newline
+        """
+        start = self._offsets[i]
+        end = self._mm.find(b'\n', start)
+        if end < 0:
+            end = self._size
+        return self._mm[start:end]
+
+    def _get(self, i: int) -> Any:
+        record = self._parse(self.get_line(i))
+        return record if self.cls is None else self.cls(record)
+
+    def __getitem__(self, item: Union[int, slice]) -> Any:
+        if isinstance(item, slice):
+            return [self._get(i) for i in range(*item.indices(len(self._offsets)))]
+        return self._get(item)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self._offsets)):
+            yield self._get(i)
+
+    def offsets(self) -> List[int]:
+        """
+        start offsets of records in the file
+        """
+        return self._offsets.tolist()
@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+
 class DataCopier(object):
     """
     A class to copy json object elements as built-in type.
@@ -6,12 +8,15 @@ def copy(self, obj):
         if isinstance(obj, dict):
             return self.copy_dict(obj)
         if isinstance(obj, list):
-            return [self.copy_list(x) for x in obj]
+            return self.copy_list(obj)
         if isinstance(obj, tuple):
-            return tuple(self.copy_tuple(x) for x in obj)
+            return self.copy_tuple(obj)
+        if isinstance(obj, Mapping):
+            # e.g. a compact json_object
+            return self.copy_dict(obj)
         return obj
 
-    def copy_dict(self, obj: dict):
+    def copy_dict(self, obj: Mapping):
         return {k: self.copy(v) for k, v in obj.items()}
 
     def copy_list(self, obj: list):
@@ -20,7 +25,155 @@ def copy_list(self, obj: list):
     def copy_tuple(self, obj: tuple):
         return tuple(self.copy(x) for x in obj)
 
-def copy_as_builtin_json(obj, copier=DataCopier()):
+_DICT, _LIST, _TUPLE = 0, 1, 2
+_BUILTIN_TYPES = (dict, list, tuple)
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+# kinds of exact built-in types, other types are checked by `_get_kind`
+_KINDS = {dict: _DICT, list: _LIST, tuple: _TUPLE}
+# nesting levels copied by recursion before the explicit stack is used
+_MAX_RECURSION_DEPTH = 100
+
+def _get_kind(obj):
+    if isinstance(obj, dict):
+        return _DICT
+    if isinstance(obj, list):
+        return _LIST
+    if isinstance(obj, tuple):
+        return _TUPLE
+    if isinstance(obj, Mapping):
+        return _DICT
+    return None
+
+class IterativeDataCopier(object):
+    """
+    A data copier walking with an explicit stack instead of recursion,
+    so deeply nested data never hits the recursion limit.
+    It copies the same types as `DataCopier`, but has no `copy_dict`, `copy_list` and `copy_tuple` hooks,
+    subclass `DataCopier` to customize how containers are copied.
+    This is the default copier of `copy_as_builtin_json`.
+    """
+    def __init__(self, share_builtin=False, memo=False):
+        """
+        :param share_builtin:   if `True`, a subtree made of built-in dict, list and tuple only
+                                is not copied, the original object is used in the result
+        :param memo:            if `True`, an object appearing more than once is copied once,
+                                and the copy is shared at every place
+        """
+        self.share_builtin = share_builtin
+        self.memo = memo
+
+    @staticmethod
+    def _enter(obj, kind):
+        # frame: source, kind, iterator of children, keys, copied children, whether any child is replaced
+        it = iter(obj.items() if kind == _DICT else obj)
+        return [obj, kind, it, [] if kind == _DICT else None, [], False]
+
+    def copy(self, obj):
+        kind = _get_kind(obj)
+        if kind is None:
+            return obj
+        if not self.memo and not self.share_builtin:
+            return self._copy_nested(obj, kind, 0)
+        return self._walk(obj, kind)
+
+    def _copy_nested(self, obj, kind, depth):
+        # Recursion is faster than the explicit stack, so it is used for the first levels,
+        # and a deeper subtree is copied by `_walk`, which also detects circular references.
+        if depth >= _MAX_RECURSION_DEPTH:
+            return self._walk(obj, kind)
+        depth += 1
+        if kind == _DICT:
+            res = {}
+            for k, v in obj.items():
+                cls = v.__class__
+                if cls in _SCALAR_TYPES:
+                    res[k] = v
+                    continue
+                kind = _KINDS.get(cls)
+                if kind is None:
+                    kind = _get_kind(v)
+                res[k] = v if kind is None else self._copy_nested(v, kind, depth)
+            return res
+        res = []
+        append = res.append
+        for v in obj:
+            cls = v.__class__
+            if cls in _SCALAR_TYPES:
+                append(v)
+                continue
+            sub = _KINDS.get(cls)
+            if sub is None:
+                sub = _get_kind(v)
+            append(v if sub is None else self._copy_nested(v, sub, depth))
+        return res if kind == _LIST else tuple(res)
+
+    def _walk(self, obj, kind):
+        share_builtin = self.share_builtin
+        # ids of objects on the stack, they are alive so their ids are not reused
+        active = {id(obj)}
+        if self.memo:
+            memo = {}
+            # keep every visited object alive, so that an id is never reused during the walk
+            visited = [obj]
+        else:
+            memo = None
+        stack = [self._enter(obj, kind)]
+        while True:
+            frame = stack[-1]
+            is_dict = frame[1] == _DICT
+            keys = frame[3]
+            values = frame[4]
+            append = values.append
+            for item in frame[2]:
+                if is_dict:
+                    k, item = item
+                    keys.append(k)
+                cls = item.__class__
+                if cls in _SCALAR_TYPES:
+                    append(item)
+                    continue
+                kind = _KINDS.get(cls)
+                if kind is None:
+                    kind = _get_kind(item)
+                    if kind is None:
+                        append(item)
+                        continue
+                if id(item) in active:
+                    raise ValueError("Circular reference detected")
+                if memo is not None:
+                    res = memo.get(id(item))
+                    if res is not None:
+                        append(res)
+                        if res is not item:
+                            frame[5] = True
+                        continue
+                    visited.append(item)
+                active.add(id(item))
+                stack.append([item, kind, iter(item.items() if kind == _DICT else item),
+                              [] if kind == _DICT else None, [], False])
+                break
+            else:
+                stack.pop()
+                src = frame[0]
+                active.discard(id(src))
+                if share_builtin and not frame[5] and src.__class__ in _BUILTIN_TYPES:
+                    res = src
+                elif is_dict:
+                    res = dict(zip(keys, values))
+                elif frame[1] == _LIST:
+                    res = values
+                else:
+                    res = tuple(values)
+                if memo is not None:
+                    memo[id(src)] = res
+                if not stack:
+                    return res
+                parent = stack[-1]
+                parent[4].append(res)
+                if res is not src:
+                    parent[5] = True
+
+def copy_as_builtin_json(obj, copier=IterativeDataCopier()):
     """
     copy a json object element as a built-in data
     """
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+generate type check expressions from field annotations, used by json_object classes with `validate=True`
+"""
+
+from typing import Any, Dict, List, Optional, Union
+from .adapter import get_typing_args, NoneType
+
+_JSON_OBJECT_FIELDS = '__json_object_fields__'
+
+def validation_error(message: str, value: Any) -> TypeError:
+    return TypeError(f"{message}, got {type(value).__name__}")
+
+class CheckExprBuilder(object):
+    """
+    build an expression which is true if a value matches the type,
+    names used by the expression are put in the given locals
+    """
+    def __init__(self, _locals: Dict[str, Any], prefix: str):
+        self._locals = _locals
+        self.prefix = prefix
+        self._num = 0
+
+    def _name(self, value: Any) -> str:
+        name = f"{self.prefix}{self._num}"
+        self._num += 1
+        self._locals[name] = value
+        return name
+
+    def _build_container(self, t: Any, var: str, depth: int, container: str, elem_arg: int, elems: str) -> str:
+        expr = f"isinstance({var}, {container})"
+        args = getattr(t, '__args__', None) or ()
+        if len(args) > elem_arg:
+            # a bare `List` or `Dict` has no arguments, only the container is checked
+            elem_var = f"_e{depth}"
+            elem_expr = self.build(args[elem_arg], elem_var, depth + 1)
+            if elem_expr is not None:
+                expr += f" and all({elem_expr} for {elem_var} in {elems.format(var)})"
+        return f"({expr})"
+
+    def build(self, t: Any, var: str, depth: int = 0) -> Optional[str]:
+        """
+        :param t:       the type
+        :param var:     expression of the value, which may be evaluated more than once
+        :param depth:   nesting depth, used to name loop variables
+        :return:    the expression, or `None` if the type can not be checked
+        """
+        if t is Any or t is object:
+            return None
+        if t is None or t is NoneType:
+            return f"{var} is None"
+        origin = getattr(t, '__origin__', None)
+        if origin is Union:
+            exprs = [self.build(x, var, depth) for x in get_typing_args(t)]
+            if any(x is None for x in exprs):
+                return None
+            return '(' + ' or '.join(exprs) + ')'
+        if origin is list or origin is List:
+            # elements are read as stored, so that a lazy `JsonList` does not convert them
+            return self._build_container(t, var, depth, 'list', 0, "list.__iter__({})")
+        if origin is dict or origin is Dict:
+            return self._build_container(t, var, depth, 'dict', 1, "dict.values({})")
+        if not isinstance(t, type):
+            # a forward reference, a type var or other special forms
+            return None
+        if t is bool:
+            return f"{var}.__class__ is bool"
+        if t is int:
+            return f"(isinstance({var}, int) and {var}.__class__ is not bool)"
+        if t is float:
+            # json numbers without fraction are parsed as int
+            return f"(isinstance({var}, (int, float)) and {var}.__class__ is not bool)"
+        if hasattr(t, _JSON_OBJECT_FIELDS):
+            # a dict is encoded as the class, whose `__init__` checks its own fields
+            return f"isinstance({var}, (dict, {self._name(t)}))"
+        return f"isinstance({var}, {self._name(t)})"
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import json
+import weakref
+from typing import List
+import pytest
+import flexible_dict as fd
+from flexible_dict.adapter import JsonObjectEncoder
+
+@fd.json_object
+class A:
+    t: str
+    k: int = 4
+
+def test_json_list():
+    raw = [dict(t='a1'), dict(t='a2', k=5)]
+    li = fd.JsonList(raw, JsonObjectEncoder(A))
+    assert list.__getitem__(li, 0) is raw[0]
+    a = li[0]
+    assert type(a) == A
+    assert li[0] is a
+    assert type(list.__getitem__(li, 1)) == dict
+    assert [x.k for x in li] == [4, 5]
+    assert type(list.__getitem__(li, 1)) == A
+    assert li == raw
+    assert json.loads(json.dumps(li)) == raw
+
+def test_json_list_no_memoize():
+    raw = [dict(t='a1')]
+    li = fd.JsonList(raw, JsonObjectEncoder(A), memoize=False)
+    assert type(li[0]) == A
+    assert li[0] is not li[0]
+    assert list.__getitem__(li, 0) is raw[0]
+
+def test_json_list_slice_and_pop():
+    li = fd.JsonList([dict(t='a1'), dict(t='a2'), dict(t='a3')], JsonObjectEncoder(A))
+    part = li[1:]
+    assert isinstance(part, fd.JsonList)
+    assert [type(x) for x in part] == [A, A]
+    assert [x.t for x in reversed(li)] == ['a3', 'a2', 'a1']
+    assert type(li.pop()) == A
+    assert len(li) == 2
+
+def test_json_list_converted_elements():
+    li = fd.JsonList(['a', 'b', 'a'], str.upper)
+    b = li[1]
+    assert b in li and 'A' in li and 'a' not in li
+    assert li.index('A') == 0 and li.index('A', 1) == 2 and li.index(b) == 1
+    with pytest.raises(ValueError):
+        li.index('a')
+    assert li.count('A') == 2 and li.count('a') == 0
+    assert li == ['A', 'B', 'A'] and li != ['a', 'b', 'a']
+    assert li == fd.JsonList(['A', 'B', 'a'], str.upper)
+
+    joined = li + ['c']
+    assert isinstance(joined, fd.JsonList) and joined == ['A', 'B', 'A', 'C']
+    other = fd.JsonList(['d'], str.upper)
+    li.extend(other)
+    assert list.__getitem__(other, 0) == 'd' and list.__getitem__(li, 3) == 'd'
+    li += ['e']
+    assert list(li) == ['A', 'B', 'A', 'D', 'E']
+
+    # elements converted by a slice are stored back in the list
+    li = fd.JsonList([dict(t='a1'), dict(t='a2')], JsonObjectEncoder(A))
+    part = li[:1]
+    assert part[0] is li[0] and type(list.__getitem__(li, 0)) is A
+    assert type(list.__getitem__(li, 1)) is dict
+
+def test_lazy_array_detector():
+    @fd.json_object(adapter_detector=fd.AdapterDetector(lazy_array=True))
+    class C:
+        ls: List[A]
+    c = C(ls=[dict(t='a1'), dict(t='a2')])
+    assert isinstance(c.ls, fd.JsonList)
+    assert type(list.__getitem__(c.ls, 0)) == dict
+    assert c.ls[0].t == 'a1'
+
+def test_cached_adapter_detector():
+    detector = fd.CachedAdapterDetector(maxsize=2)
+    e1 = detector.detect_encoder(List[A])
+    e2 = detector.detect_encoder(List[A])
+    assert e1 is e2
+    assert detector.detect_encoder(int) is None
+    info = detector.cache_info()
+    # List[A] and A are missed at first time
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+    detector.detect_encoder(str)
+    assert weakref.ref(A) not in detector._cache
+    detector.cache_clear()
+    assert detector.cache_info().currsize == 0
+
+def test_shared_encoder():
+    detector = fd.CachedAdapterDetector()
+    @fd.json_object(adapter_detector=detector)
+    class C:
+        a: List[A]
+        b: List[A]
+    fields = C.__json_object_fields__
+    assert fields['a'].encoder == fields['b'].encoder
+    assert fields['a'].encoder.__self__ is fields['b'].encoder.__self__
+
+def test_cached_adapter_detector_weak():
+    detector = fd.CachedAdapterDetector()
+    def make_class():
+        @fd.json_object(adapter_detector=detector)
+        class C:
+            a: A
+        return C
+    C = make_class()
+    assert detector.detect_encoder(C) is not None
+    assert detector.cache_info().currsize == 2
+    ref = weakref.ref(C)
+    del C
+    gc.collect()
+    assert ref() is None
+    assert detector.cache_info().currsize == 1
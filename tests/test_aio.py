@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+from typing import List
+import pytest
+import flexible_dict as fd
+
+@fd.json_object
+class Item:
+    id: int
+
+@fd.json_object
+class Record:
+    name: str
+    items: List[Item]
+
+def make_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+async def collect(it):
+    return [x async for x in it]
+
+def test_aiter_jsonl():
+    records = [dict(name=f'r{i}', items=[dict(id=i)]) for i in range(50)]
+    data = ('\n'.join(json.dumps(r) for r in records) + '\r\n\n').encode('utf-8')
+
+    async def main():
+        for chunk_size in (1, 7, 1 << 16):
+            res = await collect(Record.aiter_jsonl(make_reader(data), chunk_size=chunk_size))
+            assert res == records
+            assert all(type(r) is Record and type(r['items'][0]) is Item for r in res)
+        # the last line without newline
+        res = await collect(fd.aiter_jsonl(make_reader(data.rstrip())))
+        assert res == records
+        batches = await collect(fd.aiter_jsonl_batches(make_reader(data), cls=Item, chunk_size=100))
+        assert 1 < len(batches) < len(records)
+        with pytest.raises(ValueError):
+            await collect(fd.aiter_jsonl(make_reader(data), chunk_size=16, max_line_size=10))
+
+    asyncio.run(main())
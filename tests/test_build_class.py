@@ -2,6 +2,7 @@
 
 import os
 import json
+import pytest
 from flexible_dict.script.class_builder import build_class_from_json, ClassBuilder
 
 data_dir = os.path.join(os.path.dirname(__file__), 'data')
@@ -20,3 +21,108 @@ def test_class_builder():
 
 def test_build_class():
     build_class_from_json(["--name", "A", "--file", json_file, "--output", py_file])
+
+def test_iter_json_array():
+    import io
+    from flexible_dict.script.class_builder import iter_json_array, iter_json_lines
+    data = [dict(a=12345, b=[1.5, "x,]"]), 678, None, dict(c={"d": True})]
+    text = json.dumps(data, indent=2)
+    for chunk_size in (1, 3, 7, 1 << 16):
+        assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == data
+    assert list(iter_json_array(io.StringIO(' [ ] '))) == []
+    assert list(iter_json_array(io.StringIO('{"a": 1}'))) == [dict(a=1)]
+    data = [dict(t=True, f=False, n=None, s='\u00e9\\"'), -1.5e3, [True]]
+    text = json.dumps(data)
+    for chunk_size in (1, 2, 3, 5):
+        assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == data
+
+    # an error is raised as soon as it is read
+    class Reader(io.StringIO):
+        reads = 0
+        def read(self, n=-1):
+            Reader.reads += 1
+            return super().read(n)
+    reader = Reader('[{"a": 1}, {"a": x}, ' + ', '.join(['{"b": 2}'] * 10000) + ']')
+    it = iter_json_array(reader, chunk_size=16)
+    assert next(it) == dict(a=1)
+    with pytest.raises(json.JSONDecodeError):
+        next(it)
+    assert Reader.reads < 5
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('[{"a": 1}, {"a": tru'), chunk_size=4))
+
+    lines = '\n'.join(json.dumps(d) for d in data) + '\n\n'
+    assert list(iter_json_lines(io.StringIO(lines))) == data
+
+def test_build_class_streaming(tmp_path, capsys):
+    with open(json_file, encoding="utf-8") as f:
+        d = json.load(f)
+    with open(py_file, encoding='utf-8') as f:
+        expected_code = f.read()
+    array_file = tmp_path / "a_array.json"
+    array_file.write_text(json.dumps([d, d]), encoding='utf-8')
+    jsonl_file = tmp_path / "a.jsonl"
+    jsonl_file.write_text(json.dumps(d) + "\n" + json.dumps(d) + "\n", encoding='utf-8')
+    for args in (["--file", str(array_file), "--stream"], ["--file", str(jsonl_file), "--jsonl"]):
+        output = tmp_path / "a.py"
+        build_class_from_json(["--name", "A", "--output", str(output), "--progress", "1"] + args)
+        assert output.read_text(encoding='utf-8') == expected_code
+        assert capsys.readouterr().err.strip().endswith("2 records")
+
+def test_class_builder_merge():
+    import pickle
+    records = [
+        dict(a=1, b=dict(c="x")),
+        dict(a=2, d=[dict(e=1.5)]),
+        dict(f=None, b=dict(g=True)),
+    ]
+    expected = ClassBuilder()
+    for d in records:
+        expected.build("A", d)
+    expected.get_singular_word('items')     # the inflect engine can not be pickled
+    merged = ClassBuilder()
+    for d in records:
+        part = ClassBuilder()
+        part.build("A", d)
+        merged.merge(pickle.loads(pickle.dumps(part)))
+    assert merged.get_code_text() == expected.get_code_text()
+    assert pickle.loads(pickle.dumps(expected)).get_code_text() == expected.get_code_text()
+
+def test_build_class_workers(tmp_path):
+    with open(json_file, encoding="utf-8") as f:
+        d = json.load(f)
+    with open(py_file, encoding='utf-8') as f:
+        expected_code = f.read()
+    jsonl_file = tmp_path / "a.jsonl"
+    jsonl_file.write_text((json.dumps(d) + "\n") * 5, encoding='utf-8')
+    output = tmp_path / "a.py"
+    build_class_from_json(["--name", "A", "--file", str(jsonl_file), "--jsonl", "--output", str(output),
+                           "--workers", "2", "--chunk_size", "2"])
+    assert output.read_text(encoding='utf-8') == expected_code
+
+def test_class_builder_type_merge():
+    builder = ClassBuilder()
+    builder.build("A", dict(a=1, b="x", c=1, d=[dict(e=1), dict(f="y")], g=[1, "s", None], h=None))
+    builder.build("A", dict(a=2, b=3, c=1.5, d=[], g=[], h=None, nums=[[1], [2.5]]))
+    code = builder.get_code_text()
+    assert code.startswith("from typing import Any, List, Optional, Union\n"), code
+    assert "class D(JsonObject):\n    e: Optional[int]\n    f: Optional[str]\n" in code, code
+    assert "\n    a: int\n" in code
+    assert "\n    b: Union[str, int]\n" in code
+    assert "\n    c: float\n" in code
+    assert "\n    ds: List[D] = Field(key=\"d\")\n" in code
+    assert "\n    gs: List[Optional[Union[int, str]]] = Field(key=\"g\")\n" in code
+    assert "\n    h: Any\n" in code
+    assert "\n    nums: Optional[List[List[float]]]\n" in code
+
+def test_class_builder_name_cache():
+    builder = ClassBuilder(name_cache_size=2)
+    assert builder.get_singular_word('item_list') == 'item'
+    assert builder.get_singular_word('itemList') == 'item'
+    assert builder.get_name_by_style_and_form('userNames', style='lower_line', form='singular') == 'user_name'
+    assert builder.get_name_by_style_and_form('box', style='upper_camel', form='plural') == 'Boxes'
+    assert builder.get_name_by_style_and_form('a_b', style='lower_camel') == 'aB'
+    assert len(builder._name_cache) == 2
+    assert ('userNames', 'lower_line', 'singular') not in builder._name_cache
+    assert builder.get_name_by_style_and_form('fooBar') == 'fooBar'
+    assert len(builder._name_cache) == 2
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from typing import Optional
+import pytest
+import flexible_dict as fd
+
+class A(fd.BaseDict):
+    t: str
+
+class Order(fd.BaseDict):
+    id: int
+    amount: float = fd.Field(getter_default=0.0)
+    count: Optional[int]
+    a: A
+    note: str = fd.Field(key='n')
+
+def test_column_table():
+    rows = [
+        dict(id=1, amount=1.5, count=2, a=dict(t='x'), n='first'),
+        dict(id=2, count=None, other=True),
+        dict(id=3, amount=3.0, count=4),
+    ]
+    table = Order.from_list_columnar(rows)
+    assert len(table) == 3
+    amounts = table.column('amount')
+    assert isinstance(amounts, array)
+    assert list(amounts) == [1.5, 0.0, 3.0]
+    ids = table.column('id')
+    assert ids is table._columns['id']
+    assert sum(r.amount for r in table) == 4.5
+    # None can't be stored in a typed column
+    assert table.column('count') == [2, None, 4]
+
+    first, second = table[0], table[1]
+    assert first.note == 'first'
+    assert type(first.a) == A
+    assert second.amount == 0.0
+    assert second.note is None
+    assert second.to_dict() == dict(id=2, count=None, other=True)
+    assert table[-1].id == 3
+    assert [type(x) for x in table.to_list()] == [Order] * 3
+
+def test_row_set_value():
+    table = Order.from_list_columnar([dict(id=1)])
+    row = table[0]
+    row.amount = 2.5
+    row.a = dict(t='y')
+    assert table.column('amount')[0] == 2.5
+    assert type(row.a) == A
+    row.id = 'not an int'
+    assert table.column('id') == ['not an int']
+
+def test_column_exact_types():
+    table = Order.from_list_columnar([dict(id=1, amount=1.5), dict(id=2, amount=3)])
+    assert table[1].amount == 3 and type(table[1].amount) is int
+    assert table[1].to_dict() == dict(id=2, amount=3)
+    assert table.column('amount') == [1.5, 3]
+    table.append(dict(id=True))
+    assert table[2].id is True and table[0].id == 1
+    assert table.column('id') == [1, 2, True]
+
+    class Bad(fd.BaseDict):
+        to_dict: int
+    with pytest.raises(TypeError):
+        Bad.from_list_columnar([])
+
+def test_extract_column(monkeypatch):
+    import sys
+    columnar = sys.modules['flexible_dict.columnar']
+    monkeypatch.setattr(columnar, 'numpy', None)
+    records = Order.from_list([dict(id=1, amount=1.5), dict(id=2)])
+    amounts = Order.column(records, 'amount')
+    assert amounts == array('d', [1.5, 0.0])
+    assert Order.column(records, 'id', dtype='l') == array('l', [1, 2])
+    assert Order.column(records, 'note') == [None, None]
+    assert Order.column(Order.from_list_columnar(records), 'amount') == amounts
+
+def test_extract_column_numpy():
+    import pytest
+    numpy = pytest.importorskip('numpy')
+    records = Order.from_list([dict(id=1, amount=1.5), dict(id=2, a=dict(t='x'))])
+    amounts = Order.column(records, 'amount')
+    assert isinstance(amounts, numpy.ndarray)
+    assert amounts.dtype == numpy.float64
+    assert amounts.tolist() == [1.5, 0.0]
+    assert Order.column(records, 'id', dtype=numpy.int32).dtype == numpy.int32
+    a = Order.column(records, 'a')
+    assert a.dtype == object
+    assert a[0] is None and a[1] == dict(t='x')
+
+def test_extract_column_missing_and_none(monkeypatch):
+    import sys
+    records = Order.from_list([dict(id=1, count=2), dict(count=None), dict(id=3)])
+    table = Order.from_list_columnar(records)
+    assert table.column('id') == [1, None, 3]
+    assert Order.column(records, 'id').tolist() == [1, None, 3]
+    assert Order.column(table, 'count').tolist() == [2, None, None]
+
+    columnar = sys.modules['flexible_dict.columnar']
+    monkeypatch.setattr(columnar, 'numpy', None)
+    assert Order.column(records, 'id') == [1, None, 3]
+    assert Order.column(records, 'count') == [2, None, None]
+    assert Order.column(table, 'count') == [2, None, None]
+    with pytest.raises(TypeError):
+        Order.column(records, 'id', dtype='q')
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+from typing import List
+import flexible_dict as fd
+
+@fd.json_object
+class A:
+    t: str
+    k: int = 4
+
+@fd.json_object(compact=True)
+class C:
+    i: int = 3
+    s: str = fd.Field(key='ss')
+    a: A
+    ls: List[A]
+
+def test_compact():
+    c = C(dict(ss='x', a=dict(t='a1'), other=1), ls=[dict(t='a2')])
+    assert isinstance(c, fd.CompactDict)
+    assert not isinstance(c, dict)
+    assert not hasattr(c, '__dict__')
+    assert c.i == 3
+    assert 'i' not in c
+    assert c.s == c['ss'] == 'x'
+    assert type(c.a) == A
+    assert type(c.ls[0]) == A
+    assert c['other'] == 1
+    assert list(c.keys()) == ['ss', 'a', 'ls', 'other']
+    assert len(c) == 4
+    assert c == dict(ss='x', a=dict(t='a1'), ls=[dict(t='a2')], other=1)
+    del c['ls']
+    assert fd.copy_as_builtin_json(c) == dict(ss='x', a=dict(t='a1'), other=1)
+
+def test_compact_write():
+    c = C()
+    c.i = 5
+    c.s = 'y'
+    c['new'] = 'n'
+    assert dict(c) == dict(i=5, ss='y', new='n')
+    del c['ss']
+    assert 'ss' not in c
+    assert c.get('ss') is None
+    assert c.pop('new') == 'n'
+    assert dict(c) == dict(i=5)
+
+def test_compact_inherit():
+    @fd.json_object(compact=True)
+    class D(C):
+        j: int
+    d = D(i=1, j=2)
+    assert d.i == 1
+    assert d.j == 2
+    assert list(d.keys()) == ['i', 'j']
+
+def test_compact_pickle():
+    c = C(i=1, s='x', extra=2)
+    c2 = pickle.loads(pickle.dumps(c))
+    assert c2 == c
+    assert type(c2) is C
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from typing import List
+from typing import List, Optional
+import pytest
 import flexible_dict as fd
 
 @fd.json_object
@@ -136,6 +137,21 @@ class C(A):
     assert c.t == 1
     assert c.k == 'w'
 
+def test_redeclare_inherited_field():
+    class P(fd.BaseDict):
+        x: int
+    class Q(P):
+        x: Optional[int]
+    assert Q.__json_object_fields__['x'].getter_default is fd.MISSING
+    assert Q().x is None
+    assert Q(x=2).x == 2
+
+    @fd.json_object
+    class C(A):
+        t: Optional[str]
+    assert C().t is None
+    assert C().k == 4
+
 def test_init_subclass():
     @fd.json_object(create_init_subclass_func=True)
     class C:
@@ -150,6 +166,58 @@ class D(C):
     assert d.b == 5
     assert d.i == 8
 
+def test_helper_not_overriding_inherited_method():
+    class Base(fd.BaseDict):
+        def to_json(self, **kwargs):
+            return 'custom'
+        def pack(self):
+            return b'custom'
+    class C(Base):
+        t: int
+    c = C(t=1)
+    assert c.to_json() == 'custom'
+    assert c.pack() == b'custom'
+    # other helpers are still inherited
+    assert c.snapshot() == c
+
+    class Mixin:
+        def snapshot(self):
+            return 'mine'
+    @fd.json_object
+    class D(Mixin):
+        t: int
+    assert D(t=1).snapshot() == 'mine'
+    assert fd.loads(D(t=1).to_json()) == dict(t=1)
+
+def test_field_overriding_inherited_helper():
+    class Q(fd.BaseDict):
+        column: int
+        snapshot: str
+        load: List[int]
+    q = Q(column=3, snapshot='s', load=[1])
+    assert q.column == 3 and q.snapshot == 's' and q.load == [1]
+    assert Q().column is None
+    q.column = 4
+    assert q['column'] == 4
+    # other helpers are still inherited
+    assert fd.loads(q.to_json()) == dict(column=4, snapshot='s', load=[1])
+
+    @fd.json_object(create_field_property=False)
+    class R(Q):
+        pack: int
+    assert R(column=1, pack=2).column == 1 and R(pack=2).pack == 2
+
+    @fd.json_object(track_changes=True)
+    class T:
+        t: int
+    @fd.json_object(track_changes=True)
+    class U(T):
+        diff: int
+    u = U(diff=1)
+    assert u.diff == 1
+    u.t = 2
+    assert u.changed_keys() == {'t'}
+
 def test_BaseDict():
     class C(fd.BaseDict):
         t: int
@@ -157,3 +225,291 @@ class C(fd.BaseDict):
     c = C(t=2, k="ti")
     assert c.t == 2
     assert c.k == "ti"
+
+def test_field_property():
+    assert isinstance(B.__dict__['i'], property)
+    assert isinstance(B.__dict__['s2'], property)
+    b = B(s2='hello')
+    assert b.s2 == 'hello'
+    b.s2 = 'world'
+    assert b['k2'] == 'world'
+
+def test_field_shadowed_by_method():
+    @fd.json_object
+    class C:
+        keys: List[str]
+        t: int
+    c = C(keys=['a'], t=1)
+    assert 'keys' not in C.__dict__
+    assert list(c.keys()) == ['keys', 't']
+    assert c.t == 1
+
+def test_getattr_access():
+    @fd.json_object(create_field_property=False)
+    class C:
+        t: int = 3
+        s: str = fd.Field(key='k')
+    c = C(s='a')
+    assert 't' not in C.__dict__
+    assert c.t == 3
+    assert c.s == 'a'
+
+def test_lazy():
+    @fd.json_object(lazy=True)
+    class C:
+        a: A
+        ls: List[A]
+        t: int
+    raw_a = dict(t='a1')
+    raw_ls = [dict(t='a2'), dict(t='a3', k=5)]
+    c = C(a=raw_a, ls=raw_ls, t=1)
+    assert c['a'] is raw_a
+    assert c['ls'] is raw_ls
+    assert type(c.a) == A
+    assert c['a'] is c.a
+    assert [type(x) for x in c.ls] == [A, A]
+    assert c['ls'] is c.ls
+    assert c.ls[1].k == 5
+
+def test_lazy_field():
+    @fd.json_object
+    class C:
+        a: A = fd.Field(lazy=True)
+        b: A
+    c = C(dict(a=dict(t='a1'), b=dict(t='b1')))
+    assert type(c['a']) == dict
+    assert type(c['b']) == A
+    assert c.a.t == 'a1'
+    assert type(c['a']) == A
+
+    @fd.json_object
+    class D:
+        ls: List[A]
+        lazy_ls: List[A] = fd.Field(lazy=True)
+    d = D(ls=[dict(t='a1')], lazy_ls=[dict(t='a2')])
+    # a list is encoded as a plain list unless the field is lazy
+    assert type(d['ls']) is list and type(d.ls[0]) == A
+    assert type(d['lazy_ls']) is list
+    assert d.lazy_ls is d.lazy_ls and type(d.lazy_ls[0]) == A
+
+def test_shared_compiled_code(monkeypatch):
+    import sys
+    module = sys.modules['flexible_dict.json_object']
+    calls = []
+    def counting_exec(*args):
+        calls.append(args[0])
+        return exec(*args)
+    monkeypatch.setattr(module, 'exec', counting_exec, raising=False)
+    def make_class():
+        class C:
+            a: int
+            b: str = fd.Field(key='bb')
+            c: A
+            d: List[A]
+        return C
+    C = fd.json_object(make_class())
+    c = C(a=1, b='x', c=dict(t='t1'), d=[dict(t='t2')])
+    assert c.b == c['bb'] == 'x'
+    assert type(c.c) == A
+    assert type(c.d[0]) == A
+    # each source is compiled once
+    assert len(calls) == len(set(calls))
+    # functions with same source are compiled only once
+    calls.clear()
+    fd.json_object(make_class())
+    assert len(calls) == 0
+
+def test_code_cache(tmp_path, monkeypatch):
+    import sys
+    module = sys.modules['flexible_dict.json_object']
+    code_cache = fd.CodeCache(str(tmp_path))
+    def make_class():
+        class CachedClass:
+            a: int
+            b: str = fd.Field(key='bb')
+        return CachedClass
+    monkeypatch.setattr(module, '_factories', {})
+    fd.json_object(make_class(), code_cache=code_cache)
+    assert list(tmp_path.iterdir())
+
+    compiled = []
+    def counting_compile(*args):
+        compiled.append(args)
+        return compile(*args)
+    monkeypatch.setattr(sys.modules['flexible_dict.code_cache'], 'compile', counting_compile, raising=False)
+    monkeypatch.setattr(module, '_factories', {})
+    C = fd.json_object(make_class(), code_cache=code_cache)
+    assert not compiled
+    c = C(a=1, b='x')
+    assert c.a == 1
+    assert c.b == c['bb'] == 'x'
+
+def test_track_changes():
+    @fd.json_object(track_changes=True)
+    class Inner:
+        x: int
+        y: int = fd.field(key='yy')
+
+    @fd.json_object(track_changes=True)
+    class Outer:
+        name: str
+        inner: Inner
+        inners: List[Inner]
+        meta: dict
+
+    o = Outer(name='n', inner=dict(x=1, yy=2), inners=[dict(x=3)], meta=dict(a=1, b=dict(c=1)))
+    assert o.changed_keys() == frozenset()
+    assert o.diff() == {}
+
+    o.name = 'm'
+    o.inner.y = 5
+    del o.inner.x
+    assert o.changed_keys() == {'name'}
+    assert o.diff() == dict(name='m', inner=dict(yy=5, x=None))
+    o.mark_clean()
+    assert o.diff() == {}
+
+    o.inners[0].x = 4
+    assert o.diff() == dict(inners=[dict(x=4)])
+    o.mark_clean()
+
+    other = Outer(fd.copy_as_builtin_json(o))
+    other.mark_clean()
+    delta = dict(name='k', inner=dict(x=7, yy=None), meta=dict(a=None, b=dict(d=2)), extra=1)
+    other.patch(delta)
+    assert fd.copy_as_builtin_json(other) == dict(
+        name='k', inner=dict(x=7), inners=[dict(x=4)], meta=dict(b=dict(c=1, d=2)), extra=1)
+    assert other.diff() == dict(name='k', inner=dict(x=7, yy=None), meta=dict(b=dict(c=1, d=2)), extra=1)
+
+    snap = o.snapshot()
+    snap.name = 's'
+    assert o.diff() == {}
+
+    # None is stored as without tracking, and exported as a deletion
+    base = Outer(fd.copy_as_builtin_json(o))
+    o.mark_clean()
+    o.name = None
+    o.inner.x = None
+    assert o['name'] is None and o.inner['x'] is None
+    assert o.diff() == dict(name=None, inner=dict(x=None))
+    base.patch(o.diff())
+    assert 'name' not in base and 'x' not in base.inner
+    assert base.name is None and base.inner.x is None
+    assert base.diff() == dict(name=None)
+
+    try:
+        @fd.json_object(track_changes=True, compact=True)
+        class C:
+            x: int
+    except TypeError:
+        pass
+    else:
+        assert False
+
+def test_instrument():
+    @fd.json_object(instrument=True, instrument_sample_interval=2)
+    class Inner:
+        x: int
+
+    @fd.json_object(instrument=True)
+    class Outer:
+        inner: Inner
+        keys: List[int]
+
+    @fd.json_object(instrument=True, compact=True)
+    class Compact:
+        x: int
+
+    o = Outer(inner=dict(x=1), keys=[1])
+    for _ in range(3):
+        o.inner.x
+    o.inner.x = 2
+    assert o.keys != [1]
+    assert o.__getattr__('keys') == [1]
+
+    stats = fd.get_stats(Outer)
+    assert stats.inits.calls == 1
+    assert stats.fields['inner'].reads.calls == 4
+    assert stats.fields['keys'].reads.calls == 1
+    assert stats.as_dict()['fields']['inner'] == dict(reads=dict(calls=4), writes=dict(calls=0))
+
+    stats = fd.get_stats(o.inner)
+    assert stats.inits.calls == 1
+    assert stats.fields['x'].reads.calls == 3
+    d = stats.as_dict()['fields']['x']['reads']
+    assert d['samples'] == 1 and d['mean_time'] >= 0
+    assert stats.as_dict()['init']['samples'] == 0
+    stats.reset()
+    assert stats.fields['x'].reads.calls == 0
+
+    c = Compact(x=1)
+    c.x
+    assert fd.get_stats(c).fields['x'].reads.calls == 1
+
+    # nothing is generated for classes not instrumented
+    assert fd.get_stats(A) is None
+    assert 'calls' not in A.t.fget.__code__.co_names
+
+def test_validate():
+    from typing import Any, Dict, Optional, Union
+
+    @fd.json_object(validate=True)
+    class Inner:
+        x: int
+        y: Optional[float] = None
+
+    @fd.json_object(validate=True)
+    class Outer:
+        name: str
+        inner: Inner
+        inners: List[Inner]
+        matrix: List[List[int]]
+        scores: Dict[str, float]
+        any: Any
+        either: Union[int, str]
+        flag: bool
+
+    o = Outer(dict(name='n', inner=dict(x=1, y=2), inners=[dict(x=2)], matrix=[[1, 2], []],
+                   scores=dict(a=1.5), any=object(), either='s', flag=True))
+    assert type(o.inner) is Inner
+    o.either = 3
+    o.inner = Inner(x=3, y=0.5)
+    Outer(name='n', inner=Inner(x=1))
+
+    for kwargs in (dict(name=1), dict(inner=[]), dict(inners=[1]), dict(matrix=[[1, 'a']]),
+                   dict(scores=dict(a='x')), dict(either=1.5), dict(flag=1), dict(inner=dict(x='1')),
+                   dict(inners=[dict(x=True)])):
+        with pytest.raises(TypeError):
+            Outer(**kwargs)
+        with pytest.raises(TypeError):
+            Outer(kwargs)
+    with pytest.raises(TypeError) as e:
+        o.name = None
+    assert str(e.value) == "field 'name' of Outer expects str, got NoneType"
+    with pytest.raises(TypeError):
+        o.inner.y = 'a'
+    o.inner.y = None
+    assert o.name == 'n'
+
+    # bare generics only check the container
+    @fd.json_object(validate=True)
+    class Bare:
+        ls: List
+        d: Dict
+    Bare(ls=[1, 'a'], d=dict(a=1))
+    with pytest.raises(TypeError):
+        Bare(ls=dict())
+    with pytest.raises(TypeError):
+        Bare(d=[])
+
+    # elements of a lazy list are checked as stored, without converting them
+    @fd.json_object(validate=True, adapter_detector=fd.AdapterDetector(lazy_array=True))
+    class Lazy:
+        inners: List[Inner]
+    lazy = Lazy(inners=[dict(x=1), dict(x=2)])
+    assert isinstance(lazy.inners, fd.JsonList)
+    lazy.inners = lazy.inners
+    assert all(type(x) is dict for x in list.__iter__(lazy['inners']))
+    assert type(lazy.inners[0]) is Inner
+    with pytest.raises(TypeError):
+        lazy.inners = fd.JsonList([1])
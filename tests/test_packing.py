@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional
+import pytest
+import flexible_dict as fd
+from flexible_dict.packing import _dumps_struct, _loads_struct
+
+class Item(fd.BaseDict):
+    id: int
+    name: str
+
+class Order(fd.BaseDict):
+    id: int
+    items: List[Item]
+    main: Optional[Item]
+    note: str
+
+@fd.json_object(compact=True)
+class CompactOrder:
+    id: int
+    items: List[Item]
+
+def test_struct_format():
+    value = [None, True, False, 0, 127, 128, -1, -2 ** 70, 1.5, '', 'héllo', b'\x00', [1, [2]], {'a': {'b': None}}]
+    assert _loads_struct(_dumps_struct(value)) == value
+
+@pytest.mark.parametrize('backend', ['struct', 'msgpack'])
+def test_pack_unpack(backend):
+    if backend == 'msgpack':
+        pytest.importorskip('msgpack')
+    order = Order(id=1, items=[dict(id=2, name='a'), dict(id=3, name='b', extra=[1])], main=None, other='x')
+    data = order.pack(backend=backend)
+    assert data[0] == fd.packing.BACKENDS[backend]
+    res = Order.unpack(data)
+    assert res == order
+    assert type(res) is Order and type(res['items'][1]) is Item
+    assert 'note' not in res and res['other'] == 'x'
+    assert len(data) < len(fd.dumpb(order))
+
+    c = CompactOrder(id=1, items=[dict(id=2, name='a')])
+    res = fd.unpack(fd.pack(c, backend=backend), CompactOrder)
+    assert type(res) is CompactOrder and type(res.items[0]) is Item
+    assert dict(res) == dict(c)
+
+    with pytest.raises(ValueError):
+        Item.unpack(data)
+
+@pytest.mark.parametrize('backend', ['struct', 'msgpack'])
+def test_pack_nested_values(backend):
+    if backend == 'msgpack':
+        pytest.importorskip('msgpack')
+    c = CompactOrder(id=1, items=[dict(id=2, name='a')])
+    order = Order(id=1, items=[], note='n', meta=dict(c=c, t=(1, 2)))
+    res = Order.unpack(order.pack(backend=backend))
+    assert res['meta'] == dict(c=dict(id=1, items=[dict(id=2, name='a')]), t=[1, 2])
+
+@pytest.mark.parametrize('backend', ['struct', 'msgpack'])
+def test_pack_values_not_matching_schema(backend):
+    if backend == 'msgpack':
+        pytest.importorskip('msgpack')
+    # json_object does not validate by default, raw lists must stay raw
+    order = Order(id=1, main=[0, 'x'], items=[[1, 2], dict(id=2)])
+    res = Order.unpack(order.pack(backend=backend))
+    assert dict.__getitem__(res, 'main') == [0, 'x']
+    assert list(list.__iter__(dict.__getitem__(res, 'items'))) == [[1, 2], dict(id=2)]
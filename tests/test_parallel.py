@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import List
+import flexible_dict as fd
+from flexible_dict.parallel import from_list_parallel, from_jsonl_parallel, iter_jsonl_parallel
+
+@fd.json_object
+class Item:
+    id: int
+
+class Record(fd.BaseDict):
+    name: str
+    items: List[Item]
+    score: float = 0.5
+
+@fd.json_object(compact=True)
+class CompactRecord:
+    name: str
+    item: Item
+
+class PostInitRecord(fd.BaseDict):
+    name: str
+    items: List[Item]
+
+    def __post_init__(self):
+        self.__dict__['label'] = self.name.upper()
+
+@fd.json_object
+class InitRecord:
+    name: str
+
+    def __init__(self, d=None, **kwargs):
+        dict.__init__(self, d or {}, **kwargs)
+        self.__dict__['initialized'] = True
+
+def make_records(n):
+    records = [dict(name=f'r{i}', items=[dict(id=i)]) for i in range(n)]
+    records[3]['other'] = dict(a=1)
+    return records
+
+def test_from_list_parallel():
+    records = make_records(30)
+    res = Record.from_list(records, workers=2)
+    assert res == Record.from_list(records)
+    assert all(type(r) is Record and type(r['items'][0]) is Item for r in res)
+    assert res[3]['other'] == dict(a=1)
+    assert res[0].score == 0.5
+
+    res = from_list_parallel(CompactRecord, [dict(name='c', item=dict(id=1), x=2)], workers=2)
+    assert type(res[0]) is CompactRecord and type(res[0].item) is Item
+    assert dict(res[0]) == dict(name='c', item=dict(id=1), x=2)
+
+def test_from_jsonl_parallel(tmp_path):
+    records = make_records(100)
+    lines = [json.dumps(r).encode('utf-8') for r in records]
+    path = tmp_path / 'records.jsonl'
+    path.write_bytes(b'\n'.join(lines))
+    expected = Record.from_list(records)
+    assert Record.from_jsonl_parallel(str(path), workers=2, block_size=100) == expected
+    assert from_jsonl_parallel(Record, lines, workers=3, block_size=1000) == expected
+    assert list(iter_jsonl_parallel(Record, iter(lines), workers=2)) == expected
+
+def test_parallel_init(tmp_path):
+    records = make_records(10)
+    res = from_list_parallel(PostInitRecord, records, workers=2)
+    assert res == PostInitRecord.from_list(records)
+    assert [r.__dict__['label'] for r in res] == [r['name'].upper() for r in records]
+    assert type(res[0]['items'][0]) is Item
+
+    res = from_list_parallel(InitRecord, [dict(name='a'), dict(name='b', x=1)], workers=2)
+    assert res == [dict(name='a'), dict(name='b', x=1)]
+    assert all(type(r) is InitRecord and r.__dict__['initialized'] for r in res)
+
+def test_long_lines(tmp_path):
+    records = [dict(name='x' * 5000, items=[]), dict(name='y', items=[dict(id=1)])]
+    path = tmp_path / 'records.jsonl'
+    path.write_bytes(b'\n'.join(json.dumps(r).encode('utf-8') for r in records))
+    assert from_jsonl_parallel(Record, str(path), workers=2, block_size=64) == Record.from_list(records)
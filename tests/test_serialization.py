@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+from typing import List
+import pytest
+import flexible_dict as fd
+from flexible_dict.serialization import BACKENDS
+
+@fd.json_object
+class Item:
+    name: str
+    tags: tuple
+
+@fd.json_object(compact=True)
+class Box:
+    label: str
+    item: Item
+
+class Order(fd.BaseDict):
+    id: int
+    items: List[Item]
+    box: Box
+
+def make_order() -> Order:
+    return Order(id=1, items=[dict(name='é/1', tags=('a', 'b'))], box=Box(label='x', item=dict(name='i')))
+
+expected = dict(id=1, items=[dict(name='é/1', tags=['a', 'b'])], box=dict(label='x', item=dict(name='i')))
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps(backend):
+    order = make_order()
+    text = fd.dumps(order, backend=backend)
+    assert json.loads(text) == expected
+    assert 'é/1' in text
+    assert fd.dumpb(order, backend=backend) == text.encode('utf-8')
+    assert json.loads(fd.dumps(order, sort_keys=True, indent=2, backend=backend)) == expected
+    fp = io.StringIO()
+    fd.dump(order, fp, backend=backend)
+    assert json.loads(fp.getvalue()) == expected
+    fp = io.BytesIO()
+    fd.dump(order, fp, backend=backend)
+    assert json.loads(fp.getvalue()) == expected
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_json_compatible(backend):
+    for value in ({1: 2}, 2 ** 70, dict(a=[-2 ** 70])):
+        text = json.dumps(value, separators=(',', ':'))
+        assert fd.dumps(value, backend=backend) == text
+        assert fd.dumpb(value, backend=backend) == text.encode('utf-8')
+    with pytest.raises(TypeError):
+        fd.dumps(object(), backend=backend)
+
+def test_to_json():
+    order = make_order()
+    assert json.loads(order.to_json()) == expected
+    assert json.loads(order.box.to_json(sort_keys=True, indent=4)) == expected['box']
+    with pytest.raises(ValueError):
+        fd.dumps(order, backend='unknown')
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_loads(backend):
+    text = json.dumps(expected)
+    order = Order.loads(text, backend=backend)
+    assert type(order) is Order
+    assert type(order['items'][0]) is Item
+    assert type(order.box) is Box and type(order.box.item) is Item
+    assert order == fd.loads(text.encode('utf-8'), backend=backend)
+    orders = Order.loads(f'[{text}, {text}]', backend=backend)
+    assert len(orders) == 2 and all(type(x) is Order for x in orders)
+    assert Order.load(io.BytesIO(text.encode('utf-8')), backend=backend).id == 1
+    assert fd.load(io.StringIO(text), cls=Item, backend=backend).name is None
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import List
+import pytest
+import flexible_dict as fd
+
+@fd.json_object
+class Leaf:
+    v: int
+
+class Node(fd.BaseDict):
+    name: str
+    leaf: Leaf
+    children: List[Leaf]
+    meta: dict
+
+@fd.json_object(lazy=True)
+class LazyNode:
+    leaf: Leaf
+    leaves: List[Leaf]
+
+@fd.json_object(compact=True)
+class CompactNode:
+    leaf: Leaf
+
+def make_node() -> Node:
+    return Node(name='n', leaf=dict(v=1), children=[dict(v=2), dict(v=3)],
+                meta=dict(tags=['a'], other=dict(x=1)))
+
+def test_snapshot():
+    node = make_node()
+    expected = fd.copy_as_builtin_json(node)
+    snap = node.snapshot()
+    assert isinstance(snap, Node)
+    assert snap == node
+    assert repr(snap) == repr(node)
+
+    snap.name = 'm'
+    snap.leaf.v = 10
+    snap['children'][0].v = 20
+    for child in snap['children']:
+        child['w'] = 1
+    snap.meta['tags'].append('b')
+    snap.meta.get('other')['y'] = 2
+    assert isinstance(snap.leaf, Leaf)
+    assert fd.copy_as_builtin_json(node) == expected
+    assert fd.copy_as_builtin_json(snap) == dict(
+        name='m', leaf=dict(v=10), children=[dict(v=20, w=1), dict(v=3, w=1)],
+        meta=dict(tags=['a', 'b'], other=dict(x=1, y=2)))
+    assert json.loads(fd.dumps(snap)) == fd.copy_as_builtin_json(snap)
+
+def test_snapshot_shares_untouched():
+    node = make_node()
+    snap = node.snapshot()
+    snap.meta['tags'].append('b')
+    assert dict.__getitem__(snap, 'leaf') is dict.__getitem__(node, 'leaf')
+    assert dict.__getitem__(snap, 'children') is dict.__getitem__(node, 'children')
+    assert dict.__getitem__(snap.meta, 'other') is node.meta['other']
+    assert dict.__getitem__(snap, 'meta') is not node.meta
+
+    # a snapshot of a snapshot is independent of both
+    snap2 = snap.snapshot()
+    snap2.meta['tags'].clear()
+    assert snap.meta['tags'] == ['a', 'b']
+    assert node.meta['tags'] == ['a']
+
+def test_snapshot_lazy_and_compact():
+    node = LazyNode(leaf=dict(v=1), leaves=[dict(v=2)])
+    snap = node.snapshot()
+    snap.leaf.v = 10
+    snap.leaves[0].v = 20
+    assert isinstance(snap.leaves[0], Leaf)
+    assert fd.copy_as_builtin_json(node) == dict(leaf=dict(v=1), leaves=[dict(v=2)])
+
+    node = CompactNode(leaf=dict(v=1))
+    snap = node.snapshot()
+    snap.leaf.v = 10
+    assert node.leaf.v == 1
+
+def test_snapshot_accessors():
+    node = make_node()
+    expected = fd.copy_as_builtin_json(node)
+
+    snap = node.snapshot()
+    snap.meta.setdefault('other', {})['y'] = 1
+    snap.meta.setdefault('new', {})['y'] = 1
+    for value in snap.meta.values():
+        if isinstance(value, dict):
+            value['z'] = 1
+    for key, value in snap.items():
+        if isinstance(value, list):
+            value.append(dict(v=4))
+    snap.pop('leaf')['v'] = 10
+    assert snap.meta.popitem() == ('new', dict(y=1, z=1))
+    snap.meta.popitem()[1]['x'] = 5
+    for child in snap['children'][:2]:
+        child['v'] = 0
+    snap['children'].pop()['v'] = 30
+    copied = snap.copy()
+    copied.meta['tags'].append('b')
+    copied_children = snap['children'].copy()
+    copied_children[0]['v'] = 40
+    assert fd.copy_as_builtin_json(node) == expected
+    assert fd.copy_as_builtin_json(snap) == dict(
+        name='n', children=[dict(v=0), dict(v=0)], meta=dict(tags=['a']))
+    assert type(copied) is type(snap)
+    assert copied.meta == dict(tags=['a', 'b'])
+    assert copied_children == [dict(v=40), dict(v=0)]
+
+    # the same on a plain dict and a list
+    data = dict(a=dict(b=[1]), c=[dict(d=1)])
+    expected = fd.copy_as_builtin_json(data)
+    snap = fd.snapshot(data)
+    for value in snap.values():
+        if isinstance(value, dict):
+            value['b'].append(2)
+    for _, value in snap.items():
+        if isinstance(value, list):
+            value[0]['d'] = 2
+    snap.copy()['a']['b'].append(3)
+    assert data == expected
+    assert snap == dict(a=dict(b=[1, 2]), c=[dict(d=2)])
+
+def test_snapshot_export_and_copy():
+    node = make_node()
+    expected = fd.copy_as_builtin_json(node)
+    snap = node.snapshot()
+    dict(snap)['meta']['tags'].append('b')
+    {**snap}['leaf']['v'] = 10
+    json.dumps(snap)
+    assert fd.copy_as_builtin_json(node) == expected
+
+    # values already private to the snapshot are not shared with its copy
+    snap.meta['other']['x'] = 2
+    copied = snap.copy()
+    snap.meta['other']['x'] = 99
+    snap.meta['tags'].append('c')
+    copied_list = snap.meta['tags'].copy()
+    snap.meta['tags'].append('d')
+    assert copied.meta['other'] == dict(x=2)
+    assert copied.meta['tags'] == ['a', 'b']
+    assert copied_list == ['a', 'b', 'c']
+    assert fd.copy_as_builtin_json(node) == expected
+
+    empty = fd.snapshot({})
+    with pytest.raises(KeyError):
+        empty.popitem()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import flexible_dict as fd
+
+class Record(fd.BaseDict):
+    id: int
+    name: str
+
+def write_lines(path, records, mode='w', end='\n'):
+    with open(path, mode) as f:
+        f.write('\n'.join(json.dumps(r) for r in records) + end)
+
+def test_random_access(tmp_path):
+    path = str(tmp_path / 'records.jsonl')
+    records = [dict(id=i, name=f'r{i}') for i in range(10)]
+    write_lines(path, records[:5])
+    with open(path, 'a') as f:
+        f.write('\n  \n')
+    write_lines(path, records[5:], mode='a', end='')
+    with fd.JsonLinesStore(path, cls=Record) as store:
+        assert len(store) == 10
+        assert store[3] == records[3] and type(store[3]) is Record
+        assert store[-1].name == 'r9'
+        assert store[2:8:3] == [records[2], records[5]]
+        assert list(store) == records
+
+def test_persisted_index(tmp_path):
+    path = str(tmp_path / 'records.jsonl')
+    index_path = str(tmp_path / 'records.idx')
+    with open(path, 'w') as f:
+        f.write('{"id": 0}\n{"id": 1}\n{"id": 2')
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert len(store) == 3
+    # a header of 7 items and offsets of 3 lines
+    assert os.path.getsize(index_path) == 8 * 10
+
+    # the last line was not terminated, and is completed by the append
+    with open(path, 'a') as f:
+        f.write(', "x": 1}\n{"id": 3}\n')
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert len(store) == 4
+        assert store[2] == dict(id=2, x=1)
+        assert store[3] == dict(id=3)
+        write_lines(path, [dict(id=4)], mode='a')
+        assert store.refresh() == 5
+        assert store[4] == dict(id=4)
+
+def test_persisted_index_of_rewritten_file(tmp_path):
+    path = str(tmp_path / 'records.jsonl')
+    index_path = str(tmp_path / 'records.idx')
+    write_lines(path, [dict(id=1), dict(id=22)])
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert store.offsets() == [0, 10]
+
+    # rewritten in place with the same size and different line offsets
+    stat = os.stat(path)
+    write_lines(path, [dict(id=11), dict(id=2)])
+    assert os.path.getsize(path) == stat.st_size
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert store.offsets() == [0, 11]
+        assert list(store) == [dict(id=11), dict(id=2)]
+
+    # replaced by another file
+    tmp = path + '.new'
+    write_lines(tmp, [dict(id=1), dict(id=22)])
+    os.replace(tmp, path)
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert list(store) == [dict(id=1), dict(id=22)]
+
+    # an index of an older format is ignored
+    with open(index_path, 'wb') as f:
+        f.write((30).to_bytes(8, 'little') + bytes(8))
+    with fd.JsonLinesStore(path, index_path=index_path) as store:
+        assert list(store) == [dict(id=1), dict(id=22)]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from typing import List
+import pytest
+import flexible_dict as fd
+
+@fd.json_object
+class A:
+    t: str
+
+@fd.json_object(compact=True)
+class B:
+    ls: List[A]
+
+def test_data_copier():
+    data = dict(a=[1, (2, dict(x=3))], b=B(ls=[dict(t='t')]), c='s')
+    expected = dict(a=[1, (2, dict(x=3))], b=dict(ls=[dict(t='t')]), c='s')
+    for copier in (fd.DataCopier(), fd.IterativeDataCopier(), fd.IterativeDataCopier(memo=True),
+                   fd.IterativeDataCopier(share_builtin=True)):
+        res = copier.copy(data)
+        assert res == expected
+        assert type(res['b']) is dict and type(res['b']['ls']) is list and type(res['b']['ls'][0]) is dict
+        assert type(res['a'][1]) is tuple
+        assert res is not data
+    assert fd.copy_as_builtin_json(data) == expected
+
+def test_iterative_data_copier():
+    shared = dict(x=[1, 2])
+    data = [shared, A(t='a', s=shared), shared]
+    res = fd.IterativeDataCopier().copy(data)
+    assert res == [dict(x=[1, 2]), dict(t='a', s=dict(x=[1, 2])), dict(x=[1, 2])]
+    # repeated objects are not aliased by default
+    assert res[0] is not res[2] and res[0] is not res[1]['s']
+    res[0]['x'].append(3)
+    assert res[2] == dict(x=[1, 2]) and shared == dict(x=[1, 2])
+
+    res = fd.IterativeDataCopier(memo=True).copy(data)
+    assert res == [dict(x=[1, 2]), dict(t='a', s=dict(x=[1, 2])), dict(x=[1, 2])]
+    assert res[0] is res[2] is res[1]['s']
+    assert res[0] is not shared
+
+    res = fd.IterativeDataCopier(share_builtin=True).copy(data)
+    assert res[0] is shared
+    assert type(res[1]) is dict
+
+    deep = node = {}
+    for _ in range(sys.getrecursionlimit() * 2):
+        node['c'] = node = {}
+    res = fd.copy_as_builtin_json(deep)
+    for _ in range(sys.getrecursionlimit() * 2):
+        res = res['c']
+    assert res == {}
+
+    cycle = []
+    cycle.append(cycle)
+    for copier in (fd.IterativeDataCopier(), fd.IterativeDataCopier(memo=True)):
+        with pytest.raises(ValueError):
+            copier.copy(cycle)
+    cycle = {}
+    node = cycle
+    for _ in range(150):
+        node['c'] = node = {}
+    node['c'] = cycle
+    with pytest.raises(ValueError):
+        fd.copy_as_builtin_json(cycle)
+
+def test_copy_as_builtin_json_hooks():
+    class Copier(fd.DataCopier):
+        def copy_list(self, obj):
+            return tuple(self.copy(x) for x in obj)
+
+    data = dict(a=[1, dict(b=[2])])
+    assert fd.copy_as_builtin_json(data, Copier()) == dict(a=(1, dict(b=(2,))))
+    res = fd.copy_as_builtin_json(data)
+    assert res == data and res['a'] is not data['a']